@@ -6,6 +6,7 @@ from . import models
 class CityViewSet(ModelViewSet):
     model = models.City
     list_display = ('name', 'country', 'population')
+    search_fields = ('name', 'country__name')
 
 
 class ContinentViewSet(ModelViewSet):
@@ -38,10 +39,12 @@ class CountryViewSet(ModelViewSet):
         'became_independent_in_20_century',
         'gay_friendly')
     list_display_links = ('tld', 'name', )
+    search_fields = ('name', '=code')
 
     def tld(self, country):
         return '.' + country.code.lower()
     tld.short_description = 'TLD'
+    tld.admin_order_field = 'code'
 
     def became_independent_in_20_century(self, country):
         if country.independence_day:
@@ -1,10 +1,24 @@
 import re
 import warnings
 from functools import partial
-from django.template import TemplateDoesNotExist
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template import TemplateDoesNotExist, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.loaders.cached import Loader as CachedLoader
 from django.template.loader import get_template, select_template
 from django.utils import six
-from django.utils.encoding import smart_text
+from django.utils.encoding import force_text, smart_text
+
+from .profiling import profiled
+
+try:
+    from django.utils.autoreload import file_changed
+except ImportError:
+    # django < 2.2, the autoreloader does not watch the templates
+    file_changed = None
 
 
 class LayoutNode(object):
@@ -18,12 +32,14 @@ class LayoutNode(object):
     def get_context_data(self, context):
         return {}
 
+    @profiled('template', lambda self, context: context['template'] if 'template' in context else self.template_name)
     def get_template(self, context):
         template_name = self.template_name
         if 'template' in context:
             template_name = context['template']
         return get_template("{}/{}".format(context['form_template_pack'], template_name))
 
+    @profiled('layout', lambda self, context, **options: type(self).__name__)
     def render(self, context, **options):
         context.push()
         try:
@@ -51,20 +67,102 @@ def _camel_case_to_underscore(name):
                   re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)).lower()
 
 
-def _get_field_template(template_pack, field):
+_field_templates_cache = {}  # (template_pack, field_cls, widget_cls) -> template name or None
+_field_templates_cache_enabled = None
+
+
+def clear_field_templates_cache(**kwargs):
+    _field_templates_cache.clear()
+
+
+def _uses_cached_loaders():
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            return False
+        if not all(isinstance(loader, CachedLoader) for loader in engine.engine.template_loaders):
+            return False
+    return True
+
+
+def _is_field_templates_cache_enabled():
+    """
+    By default, templates are remembered only if the DEBUG is off or
+    all template loaders are cached, so new and changed templates
+    are picked up by the development server as without the cache.
+    """
+    global _field_templates_cache_enabled
+
+    if _field_templates_cache_enabled is None:
+        enabled = getattr(settings, 'MATERIAL_FIELD_TEMPLATES_CACHE', None)
+        if enabled is None:
+            enabled = not settings.DEBUG or _uses_cached_loaders()
+        _field_templates_cache_enabled = enabled
+    return _field_templates_cache_enabled
+
+
+@receiver(setting_changed)
+def _on_setting_changed(setting, **kwargs):
+    global _field_templates_cache_enabled
+
+    if setting in ('DEBUG', 'TEMPLATES', 'MATERIAL_FIELD_TEMPLATES_CACHE'):
+        clear_field_templates_cache()
+        _field_templates_cache_enabled = None
+
+
+if file_changed is not None:
+    file_changed.connect(clear_field_templates_cache)
+
+
+def _get_field_template_names(template_pack, field_cls, widget_cls):
     widget_templates = [
         '{}_{}.html'.format(cls.__module__.split('.', 1)[0], cls.__name__.lower())
-        for cls in type(field.widget).mro()[:-2]]
+        for cls in widget_cls.mro()[:-2]]
+
+    field_templates = []
+    if field_cls is not None:
+        field_templates = [
+            '{}_{}/{}'.format(cls.__module__.split('.', 1)[0], cls.__name__.lower(), widget_template)
+            for cls in field_cls.mro()[:-2]
+            for widget_template in widget_templates]
+
+    return ["{}/fields/{}".format(template_pack, template_name)
+            for template_name in widget_templates + field_templates]
+
+
+@profiled('template', lambda template_pack, field_cls, widget_cls: '{}/{}'.format(
+    field_cls.__name__ if field_cls is not None else '', widget_cls.__name__))
+def _select_field_template(template_pack, field_cls, widget_cls):
+    """
+    Select the most specific template for a field and widget classes.
 
-    field_templates = [
-        '{}_{}/{}'.format(cls.__module__.split('.', 1)[0], cls.__name__.lower(), widget_template)
-        for cls in type(field).mro()[:-2]
-        for widget_template in widget_templates]
+    The winning template name, or the absence of any, is remembered per
+    process. Set `MATERIAL_FIELD_TEMPLATES_CACHE` setting to True or
+    False to override the DEBUG and template loaders based default.
+    """
+    if not _is_field_templates_cache_enabled():
+        return select_template(_get_field_template_names(template_pack, field_cls, widget_cls))
+
+    key = (template_pack, field_cls, widget_cls)
+    try:
+        template_name = _field_templates_cache[key]
+    except KeyError:
+        template_names = _get_field_template_names(template_pack, field_cls, widget_cls)
+        try:
+            template = select_template(template_names)
+        except TemplateDoesNotExist:
+            _field_templates_cache[key] = None
+            raise
+        _field_templates_cache[key] = template.template.name
+        return template
 
-    template_names = ["{}/fields/{}".format(template_pack, template_name)
-                      for template_name in widget_templates + field_templates]
+    if template_name is None:
+        raise TemplateDoesNotExist(', '.join(
+            _get_field_template_names(template_pack, field_cls, widget_cls)))
+    return get_template(template_name)
 
-    return select_template(template_names)
+
+def _get_field_template(template_pack, field):
+    return _select_field_template(template_pack, type(field), type(field.widget))
 
 
 class Layout(LayoutNode):
@@ -75,6 +173,34 @@ class Layout(LayoutNode):
 
     def __init__(self, *elements):
         self.elements = _convert_to_field(elements)
+        self._fields = None
+        self._signature = None
+
+    def compile(self):
+        """
+        Precompute the layout fields order, signature and rows spans,
+        once per layout instance.
+
+        Only this data is cached. The layout is still rendered by the
+        layout templates, that walk the elements tree on each render.
+        """
+        if self._fields is None:
+            for row in _collect_elements(Row, self):
+                row.get_container_spans(12)
+            self._fields = tuple(field.field_name for field in _collect_elements(Span, self))
+            self._signature = _element_signature(self)
+        return self
+
+    @property
+    def fields(self):
+        return list(self.compile()._fields)
+
+    @property
+    def signature(self):
+        """
+        Layout structure description, stable between processes.
+        """
+        return self.compile()._signature
 
 
 class Fieldset(LayoutNode):
@@ -92,20 +218,32 @@ class Row(LayoutNode):
     def __init__(self, *elements, **kwargs):
         self.elements = _convert_to_field(elements)
         self.row_id = kwargs.pop('row_id', None)
+        self._container_spans = {}  # container size -> ((element, span), ...)
 
-    def __getattr__(self, name):
-        _, container_size = name.split('_')
-        container_size = int(container_size)
-
-        def elements_iterator():
+    def get_container_spans(self, container_size):
+        try:
+            return self._container_spans[container_size]
+        except KeyError:
             elements_span = sum(element.span_columns for element in self.elements)
             if container_size % elements_span != 0:
                 warnings.warn("Can't equally divide container {} for {} span elements"
                               .format(container_size, self.elements))
 
             span_multiplier = container_size // elements_span
-            for element in self.elements:
-                yield element, element.span_columns * span_multiplier
+            spans = tuple((element, element.span_columns * span_multiplier)
+                          for element in self.elements)
+            self._container_spans[container_size] = spans
+            return spans
+
+    def __getattr__(self, name):
+        if not name.startswith('container_'):
+            raise AttributeError(name)
+
+        _, container_size = name.split('_')
+        spans = self.get_container_spans(int(container_size))
+
+        def elements_iterator():
+            return iter(spans)
 
         return elements_iterator
 
@@ -126,6 +264,7 @@ class Span(object):
         self.span_columns = span_columns
         self.field_name = field_name
 
+    @profiled('field', lambda self, context, **options: self.field_name)
     def render(self, context, **options):
         template_pack = context['form_template_pack']
         form = context['form']
@@ -135,10 +274,7 @@ class Span(object):
             if 'template' in options:
                 template = select_template(["{}/{}".format(template_pack, options['template'])])
             elif 'widget' in options:
-                widget_templates = [
-                    '{}/fields/{}_{}.html'.format(template_pack, cls.__module__.split('.', 1)[0], cls.__name__.lower())
-                    for cls in type(options['widget']).mro()[:-2]]
-                template = select_template(widget_templates)
+                template = _select_field_template(template_pack, None, type(options['widget']))
             else:
                 template = _get_field_template(template_pack, bound_field.field)
         except TemplateDoesNotExist:
@@ -193,10 +329,26 @@ def _collect_elements(element_cls, parent, container=None):
     return container
 
 
+def _element_signature(element):
+    if isinstance(element, Span):
+        return str(element)
+
+    attrs = ','.join(
+        '{}={}'.format(name, force_text(value))
+        for name, value in sorted(vars(element).items())
+        if not name.startswith('_') and name != 'elements')
+    children = ','.join(
+        _element_signature(child) for child in getattr(element, 'elements', []))
+
+    return '{}({};{})'.format(type(element).__name__, attrs, children)
+
+
 class LayoutMixin(object):
     """
     Extracts from layout `fields` for django FormView
     """
     @property
     def fields(self):
+        if isinstance(self.layout, Layout):
+            return self.layout.fields
         return [field.field_name for field in _collect_elements(Span, self.layout)]
\ No newline at end of file
@@ -0,0 +1,211 @@
+"""
+Per-request widget choices cache.
+
+A formset or a layout repeating the same `ModelChoiceField` runs the
+same choices query for each rendered field. Within a request, model
+choices are evaluated once per queryset SQL and params.
+
+The cache is active for the request/response cycle only. Outside of
+it, use::
+
+    with choices_cache():
+        template.render(context)
+
+The cache is cleared when a model instance is saved or deleted within
+the request. Rows changed with `QuerySet.update()` or raw SQL are not
+tracked, use `choices_cache()` again to reset it.
+"""
+from __future__ import division
+
+import math
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.forms.models import ModelChoiceIterator
+from django.utils.encoding import force_text
+from django.utils.functional import cached_property
+
+from .compat import EmptyResultSet
+
+
+__all__ = ['choices_cache', 'get_choices', 'ChoiceView']
+
+_state = threading.local()
+
+
+def start_cache():
+    _state.choices = {}
+
+
+def stop_cache():
+    _state.choices = None
+
+
+@contextmanager
+def choices_cache():
+    start_cache()
+    try:
+        yield
+    finally:
+        stop_cache()
+
+
+@receiver(request_started)
+def _on_request_started(**kwargs):
+    start_cache()
+
+
+@receiver(request_finished)
+def _on_request_finished(**kwargs):
+    stop_cache()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def _on_instance_changed(**kwargs):
+    cache = getattr(_state, 'choices', None)
+    if cache:
+        cache.clear()
+
+
+def _get_label_key(field):
+    # bound methods are unique per field instance, so use the function
+    label_from_instance = field.label_from_instance
+    if getattr(label_from_instance, '__self__', None) is field:
+        return label_from_instance.__func__
+    return label_from_instance
+
+
+def _get_cache_key(choices):
+    field, queryset = choices.field, choices.queryset
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    key = (type(field), type(choices), _get_label_key(field),
+           field.empty_label, field.to_field_name, queryset.db, sql, params)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _evaluate(choices):
+    # list() would call ModelChoiceIterator.__len__, which runs
+    # an extra query on django < 1.11
+    return [choice for choice in choices]
+
+
+def get_choices(widget):
+    """
+    Returns the widget choices list.
+
+    Model choices are shared between widgets with the same queryset
+    while the cache is active.
+    """
+    choices = widget.choices
+    cache = getattr(_state, 'choices', None)
+    if cache is None or not isinstance(choices, ModelChoiceIterator):
+        return _evaluate(choices)
+
+    key = _get_cache_key(choices)
+    if key is None:
+        return _evaluate(choices)
+
+    try:
+        return cache[key]
+    except KeyError:
+        result = cache[key] = _evaluate(choices)
+        return result
+
+
+class ChoiceView(object):
+    """
+    Bound field choices, processed in a single pass.
+
+    Provides the selected values set, the default (empty) choice
+    flag and the options grouping for the select, radio and checkbox
+    templates.
+    """
+    def __init__(self, bound_field):
+        self.bound_field = bound_field
+        self._columns = {}
+
+    @cached_property
+    def selected(self):
+        selected = self.bound_field.value()
+        if not isinstance(selected, (list, tuple)):
+            selected = [selected]
+        return set(force_text(v) for v in selected)
+
+    def get_choices(self):
+        widget = self.bound_field.field.widget
+        if hasattr(widget, 'selected_choices'):
+            # RemoteSelect
+            return widget.selected_choices(self.selected)
+        return get_choices(widget)
+
+    @cached_property
+    def choices(self):
+        return list(self.get_choices())
+
+    @cached_property
+    def _processed(self):
+        selected, has_default_choice = self.selected, False
+        groups = OrderedDict()
+        position = 0
+
+        def option(value, label):
+            if value is None:
+                value = ''
+            value = force_text(value)
+            return (label, value, value in selected, position)
+
+        for option_value, option_label in self.choices:
+            if isinstance(option_label, (list, tuple)):
+                items = groups.setdefault(option_value, [])
+                for value, label in option_label:
+                    has_default_choice = has_default_choice or value is None or value == ''
+                    items.append(option(value, label))
+                    position += 1
+            else:
+                has_default_choice = has_default_choice or option_value is None or option_value == ''
+                groups.setdefault(None, []).append(option(option_value, option_label))
+                position += 1
+
+        return list(groups.items()), has_default_choice
+
+    @property
+    def groups(self):
+        """
+        List of (group_name, [(label, value, selected, position)]).
+
+        Options without a group are listed under the None group.
+        """
+        return self._processed[0]
+
+    @property
+    def has_default_choice(self):
+        return self._processed[1]
+
+    def columns(self, count):
+        """
+        List of (group_name, [(col_span, options)]), with each group
+        options split into `count` columns.
+        """
+        count = int(count)
+        if count not in self._columns:
+            col_span = 12 // count
+            result = []
+            for group, items in self.groups:
+                per_column = max(int(math.ceil(len(items) / count)), 1)
+                result.append((group, [
+                    (col_span, items[i:i + per_column])
+                    for i in range(0, len(items), per_column)]))
+            self._columns[count] = result
+        return self._columns[count]
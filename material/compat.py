@@ -9,7 +9,21 @@ from django.utils import six
 from django.utils.html import conditional_escape
 
 
-__all__ = ['simple_tag']
+__all__ = ['simple_tag', 'EmptyResultSet', 'MiddlewareMixin']
+
+
+try:
+    from django.core.exceptions import EmptyResultSet  # NOQA
+except ImportError:
+    # django < 1.11
+    from django.db.models.sql.datastructures import EmptyResultSet  # NOQA
+
+
+try:
+    from django.utils.deprecation import MiddlewareMixin  # NOQA
+except ImportError:
+    # django < 1.10
+    MiddlewareMixin = object
 
 
 try:
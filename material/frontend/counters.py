@@ -0,0 +1,99 @@
+"""
+DataList rows counting strategies.
+
+A strategy `count(queryset)` method returns the number of rows, or
+None if the total is unknown. In that case the DataList reports
+a total enough to show the next page link, if there are more rows.
+"""
+import hashlib
+import json
+
+from django.core.cache import caches
+from django.db import connections
+from django.utils import six
+from django.utils.encoding import force_bytes
+
+from ..compat import EmptyResultSet
+
+
+__all__ = ['ExactCount', 'CachedCount', 'EstimatedCount', 'HasMoreCount']
+
+
+class ExactCount(object):
+    """
+    SELECT COUNT(*) on each request.
+    """
+    def count(self, queryset):
+        return queryset.count()
+
+
+class CachedCount(object):
+    """
+    Exact count, cached for `timeout` seconds per queryset SQL.
+    """
+    def __init__(self, timeout=300, cache_alias='default', counter=None):
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        self.counter = counter if counter is not None else ExactCount()
+
+    def get_cache_key(self, queryset):
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        digest = hashlib.md5(force_bytes('{}:{}:{!r}'.format(queryset.db, sql, params))).hexdigest()
+        return 'material.datalist.count.{}'.format(digest)
+
+    def count(self, queryset):
+        key = self.get_cache_key(queryset)
+        if key is None:
+            return 0
+
+        cache = caches[self.cache_alias]
+        result = cache.get(key)
+        if result is None:
+            result = self.counter.count(queryset)
+            cache.set(key, result, self.timeout)
+        return result
+
+
+class EstimatedCount(object):
+    """
+    PostgreSQL planner estimate, for the large result sets.
+
+    If the estimate is lower than the `threshold`, or the database
+    is not a PostgreSQL, the rows are counted exactly.
+    """
+    def __init__(self, threshold=100000):
+        self.threshold = threshold
+
+    def estimate(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) {}'.format(sql), params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, six.string_types):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def count(self, queryset):
+        estimate = self.estimate(queryset)
+        if estimate is None or estimate < self.threshold:
+            return queryset.count()
+        return estimate
+
+
+class HasMoreCount(object):
+    """
+    Do not count at all, only check if there is a next page.
+    """
+    def count(self, queryset):
+        return None
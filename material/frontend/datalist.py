@@ -1,11 +1,26 @@
 from __future__ import unicode_literals
 
-from collections import OrderedDict
+import base64
+import datetime
+import json
+import logging
+import operator
+import uuid
+from collections import OrderedDict, defaultdict
+from functools import reduce
 
-from django.core.exceptions import FieldDoesNotExist
-from django.utils.encoding import smart_text
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.utils import six
+from django.utils.encoding import force_bytes, force_text, smart_text
+from django.utils.functional import cached_property
 from django.forms.forms import pretty_name
 
+from .counters import ExactCount
+
 
 def _get_attr_label(owner, attr_name):
     attr = getattr(owner, attr_name)
@@ -22,6 +37,90 @@ def _get_attr_label(owner, attr_name):
         return attr_name
 
 
+def _lookup_needs_distinct(model, lookup):
+    """
+    Lookups that span a to-many relation can produce duplicates.
+    """
+    opts = model._meta
+    for part in lookup.split('__'):
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            return False
+        if field.many_to_many or field.one_to_many:
+            return True
+        if not field.is_relation:
+            return False
+        opts = field.related_model._meta
+    return False
+
+
+def _lookup_nullable(model, lookup):
+    """
+    Lookups that can have NULL values, through a nullable field or a
+    relation join. Unknown lookups, ex: annotations, are nullable.
+    """
+    opts = model._meta
+    for part in lookup.split('__'):
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            return True
+        if getattr(field, 'null', True) or field.many_to_many or field.one_to_many:
+            return True
+        if not field.is_relation:
+            return False
+        opts = field.related_model._meta
+    return False
+
+
+def _get_order_lookup(model, lookup):
+    """
+    Returns (lookup, comparable) for an order_by lookup.
+
+    A to-one relation is ordered by the key column, unless the related
+    model has the default ordering. Then the related model ordering is
+    used, and rows can't be compared by a single value.
+    """
+    opts, parts = model._meta, lookup.split('__')
+    for n, name in enumerate(parts):
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            return lookup, True
+        if not field.is_relation:
+            return lookup, True
+        if n == len(parts) - 1:
+            if field.concrete and (field.many_to_one or field.one_to_one) and name != field.attname:
+                if field.related_model._meta.ordering:
+                    return lookup, False
+                return '__'.join(parts[:-1] + [field.attname]), True
+            return lookup, True
+        opts = field.related_model._meta
+    return lookup, True
+
+
+logger = logging.getLogger('material.frontend.datalist')
+
+
+class _CursorJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # keep microseconds, DjangoJSONEncoder truncates them
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        elif isinstance(o, uuid.UUID):
+            return str(o)
+        return super(_CursorJSONEncoder, self).default(o)
+
+
+def _get_lookup_value(obj, lookup):
+    for name in lookup.split('__'):
+        if obj is None:
+            break
+        obj = getattr(obj, name)
+    return obj
+
+
 class ModelField(object):
     def __init__(self, field):
         self.field = field
@@ -29,6 +128,11 @@ class ModelField(object):
     def get_value(self, obj):
         return getattr(obj, self.field.name)
 
+    @property
+    def order_field(self):
+        if getattr(self.field, 'concrete', False) and not self.field.many_to_many:
+            return self.field.name
+
     @property
     def label(self):
         try:
@@ -50,6 +154,10 @@ class ModelAttr(object):
             return attr()
         return attr
 
+    @property
+    def order_field(self):
+        return getattr(getattr(self.model, self.name, None), 'admin_order_field', None)
+
     @property
     def label(self):
         if self._label:
@@ -62,22 +170,73 @@ class DataSourceAttr(object):
         self.data_source = data_source
         self.name = name
 
+    @cached_property
+    def attr(self):
+        return getattr(self.data_source, self.name)
+
     def get_value(self, obj):
-        attr = getattr(self.data_source, self.name)
+        attr = self.attr
         if callable(attr):
             return attr(obj)
         return attr
 
+    @property
+    def order_field(self):
+        return getattr(self.attr, 'admin_order_field', None)
+
     @property
     def label(self):
         return _get_attr_label(self.data_source, self.name)
 
 
 class DataList(object):
-    def __init__(self, model, queryset, data_sources=None, list_display=None, list_display_links=None):
+    """
+    Table data for a queryset.
+
+    `search_fields` - model fields looked up by the search term, prefix
+    a field name with `^` for startswith, `=` for exact and `@` for
+    full-text search, as in the django admin. Columns are sortable if
+    they are concrete model fields or have the `admin_order_field`
+    attribute.
+
+    `counter` - rows counting strategy from `material.frontend.counters`,
+    ExactCount by default.
+
+    `keyset_pagination` - `get_data` returns the `next_cursor`, with
+    the last row ordering values. Passed back, it fetches the next
+    page with a WHERE condition on the ordering columns instead of
+    an OFFSET scan.
+
+    `select_related` - None to follow the foreign key columns
+    automatically, False to disable, or list of lookups.
+    `prefetch_related` - list of lookups to prefetch for the page rows.
+    `only_fields` - True to load only the columns fields, if all columns
+    are the model fields, or list of fields to load. Other fields are
+    deferred, and loaded by a query per row on access.
+    With DEBUG enabled, columns that run queries per row are logged.
+    """
+    def __init__(self, model, queryset, data_sources=None, list_display=None, list_display_links=None,
+                 search_fields=None, counter=None, keyset_pagination=False,
+                 select_related=None, prefetch_related=None, only_fields=False):
         self.model = model
         self.queryset = queryset
+        self.unfiltered_queryset = queryset
         self.data_sources = data_sources if data_sources else []
+        self.search_fields = search_fields if search_fields else ()
+        self.counter = counter if counter is not None else ExactCount()
+        self.filtered = False
+        self._total = None
+
+        self.keyset_pagination = keyset_pagination
+        self.select_related = select_related
+        self.prefetch_related = prefetch_related if prefetch_related else ()
+        self.only_fields = only_fields
+        self._columns = {}
+
+        # last get_data page
+        self.page_end = 0
+        self.has_more = False
+        self.next_cursor = None
 
         self.list_display = list_display if list_display else ('__str__', )
 
@@ -101,31 +260,336 @@ class DataList(object):
 
         raise AttributeError("Unable to lookup '{}' on {}" .format(attr_name, self.model._meta.object_name))
 
+    def get_column(self, field_name):
+        """
+        Returns the column accessor, resolved once per datalist.
+        """
+        try:
+            return self._columns[field_name]
+        except KeyError:
+            column = self._columns[field_name] = self.get_data_attr(field_name)
+            return column
+
+    def _get_relation_lookup(self, lookup):
+        """
+        Returns the part of the lookup that follows the to-one relations.
+        """
+        opts, path = self.model._meta, []
+        for name in lookup.lstrip('-').split('__'):
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                break
+            if not (field.is_relation and field.concrete and (field.many_to_one or field.one_to_one)):
+                break
+            path.append(name)
+            opts = field.related_model._meta
+        return '__'.join(path)
+
+    def get_select_related(self):
+        """
+        Foreign key columns and the ordering lookups through them.
+        """
+        if self.select_related is not None:
+            return list(self.select_related) if self.select_related else []
+
+        result = []
+        for field_name in self.list_display:
+            try:
+                column = self.get_column(field_name)
+            except AttributeError:
+                continue
+            lookups = [field_name] if isinstance(column, ModelField) else []
+            if column.order_field:
+                lookups.append(column.order_field)
+            for lookup in lookups:
+                relation = self._get_relation_lookup(lookup)
+                if relation and relation not in result:
+                    result.append(relation)
+        return result
+
+    def get_only_fields(self):
+        """
+        Model fields to load, None to load all fields.
+        """
+        if not self.only_fields:
+            return None
+        elif self.only_fields is not True:
+            return list(self.only_fields)
+
+        opts = self.model._meta
+        fields = [opts.pk.name]
+        for field_name in self.list_display:
+            try:
+                column = self.get_column(field_name)
+            except AttributeError:
+                return None
+            if not isinstance(column, ModelField) or column.order_field is None:
+                return None
+            fields.append(field_name)
+
+        for lookup in list(self.queryset.query.order_by) or list(opts.ordering):
+            if not isinstance(lookup, six.string_types):
+                return None
+            lookup = lookup.lstrip('-')
+            if lookup != 'pk' and '__' not in lookup:
+                try:
+                    # foreign key column name
+                    fields.append(opts.get_field(lookup).name)
+                except FieldDoesNotExist:
+                    fields.append(lookup)
+        return [field for n, field in enumerate(fields) if field not in fields[:n]]
+
+    def optimize_queryset(self, queryset):
+        select_related = self.get_select_related()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+
+        only_fields = self.get_only_fields()
+        if only_fields is not None and set(select_related) <= set(only_fields):
+            queryset = queryset.only(*only_fields)
+        return queryset
+
+    def _count(self, queryset):
+        result = self.counter.count(queryset)
+        if result is None:
+            # enough to show the link to the next page
+            result = self.page_end + 1 if self.has_more else self.page_end
+        return result
+
     def total(self):
-        return self.queryset.count()
+        if self._total is None:
+            self._total = self._count(self.unfiltered_queryset)
+        return self._total
 
     def total_filtered(self):
-        return self.queryset.count()
+        """
+        Count of the filtered rows, the total is reused if no filter applied.
+        """
+        if not self.filtered:
+            return self.total()
+        return self._count(self.queryset)
 
-    def set_filter(self):
+    def get_search_lookup(self, field_name):
+        if field_name.startswith('^'):
+            return '{}__istartswith'.format(field_name[1:])
+        elif field_name.startswith('='):
+            return '{}__iexact'.format(field_name[1:])
+        elif field_name.startswith('@'):
+            return '{}__search'.format(field_name[1:])
+        return '{}__icontains'.format(field_name)
+
+    def set_filter(self, search):
         """
-        TODO
+        Filter the queryset by each word of the search term, in any of
+        the `search_fields`.
         """
+        if not search or not self.search_fields:
+            return
+
+        lookups = [self.get_search_lookup(field_name) for field_name in self.search_fields]
+        for bit in search.split():
+            self.queryset = self.queryset.filter(
+                reduce(operator.or_, (Q(**{lookup: bit}) for lookup in lookups)))
+        if any(_lookup_needs_distinct(self.model, lookup) for lookup in lookups):
+            self.queryset = self.queryset.distinct()
+        self.filtered = True
+
+    def get_order_field(self, field_name):
+        try:
+            return self.get_column(field_name).order_field
+        except AttributeError:
+            return None
 
-    def set_ordering(self):
+    @property
+    def sortable_columns(self):
+        return [field_name for field_name in self.list_display if self.get_order_field(field_name)]
+
+    def set_ordering(self, ordering):
         """
-        TODO
+        Order the queryset by list of (column name, descending) pairs.
+
+        Not sortable columns are ignored, the primary key is added
+        to make the order deterministic.
         """
+        order_by = []
+        for field_name, descending in ordering:
+            order_field = self.get_order_field(field_name)
+            if order_field is None:
+                continue
+            if order_field.startswith('-'):
+                order_field, descending = order_field[1:], not descending
+            order_field, _ = _get_order_lookup(self.model, order_field)
+            order_by.append('-' + order_field if descending else order_field)
+
+        if order_by:
+            pk_name = self.model._meta.pk.name
+            if not set(order_by) & {pk_name, '-' + pk_name, 'pk', '-pk'}:
+                order_by.append('-pk' if order_by[-1].startswith('-') else 'pk')
+            self.queryset = self.queryset.order_by(*order_by)
 
     def get_headers_data(self):
         for field_name in self.list_display:
-            attr = self.get_data_attr(field_name)
-            yield field_name, attr.label
+            yield field_name, self.get_column(field_name).label
+
+    def get_keyset_ordering(self):
+        """
+        List of (lookup, descending) the queryset is ordered by, ended
+        with the primary key. None if the ordering can't be used for
+        the keyset pagination, ex: NULL values can't be compared, so
+        nullable columns are paginated with the OFFSET.
+        """
+        opts = self.model._meta
+        order_by = list(self.queryset.query.order_by) or list(opts.ordering)
+
+        result = []
+        for lookup in order_by:
+            if not isinstance(lookup, six.string_types) or lookup == '?':
+                return None
+            descending = lookup.startswith('-')
+            lookup = lookup.lstrip('-')
+            if lookup == 'pk':
+                lookup = opts.pk.attname
+            elif _lookup_nullable(self.model, lookup):
+                return None
+            else:
+                lookup, comparable = _get_order_lookup(self.model, lookup)
+                if not comparable:
+                    return None
+            result.append((lookup, descending))
+
+        if opts.pk.attname not in [lookup for lookup, _ in result]:
+            result.append((opts.pk.attname, result[-1][1] if result else False))
+        return result
+
+    def encode_cursor(self, ordering, item):
+        values = [_get_lookup_value(item, lookup) for lookup, _ in ordering]
+        if any(value is None for value in values):
+            # NULL is not comparable
+            return None
+        data = json.dumps([ordering, values], cls=_CursorJSONEncoder)
+        return force_text(base64.urlsafe_b64encode(force_bytes(data)))
+
+    def decode_cursor(self, ordering, cursor):
+        """
+        Returns the cursor values, or None if the cursor is invalid
+        or made for another ordering.
+        """
+        try:
+            cursor_ordering, values = json.loads(force_text(base64.urlsafe_b64decode(force_bytes(cursor))))
+        except (TypeError, ValueError):
+            return None
+        if [list(order) for order in ordering] != cursor_ordering or len(values) != len(ordering):
+            return None
+        return values
+
+    def get_keyset_filter(self, ordering, values):
+        conditions = []
+        for n, (lookup, descending) in enumerate(ordering):
+            condition = {prev_lookup: value for (prev_lookup, _), value in zip(ordering[:n], values)}
+            condition['{}__{}'.format(lookup, 'lt' if descending else 'gt')] = values[n]
+            conditions.append(Q(**condition))
+        return reduce(operator.or_, conditions)
+
+    def get_page_queryset(self, start, length, cursor=None):
+        """
+        Returns the page queryset, with one extra row to know if there
+        is a next page, and the keyset ordering or None.
+        """
+        queryset = self.optimize_queryset(self.queryset)
+        ordering = self.get_keyset_ordering() if self.keyset_pagination else None
+        if ordering is None:
+            return queryset[start:start + length + 1], None
 
-    def get_data(self, start, length):
-        for item in self.queryset[start:start+length]:
+        queryset = queryset.order_by(*[
+            '-' + lookup if descending else lookup
+            for lookup, descending in ordering])
+        values = self.decode_cursor(ordering, cursor) if cursor else None
+        if values is not None:
+            try:
+                return queryset.filter(self.get_keyset_filter(ordering, values))[:length + 1], ordering
+            except (TypeError, ValueError, ValidationError):
+                # cursor values not valid for the ordering fields
+                pass
+        return queryset[start:start + length + 1], ordering
+
+    def iter_items(self, chunk_size=1000):
+        """
+        Yields all queryset items, fetched in primary key ordered chunks.
+
+        Each chunk is a separate `pk > last pk` query, so neither the
+        whole queryset nor an OFFSET scan is required.
+        """
+        queryset = self.optimize_queryset(self.queryset).order_by('pk')
+        last_pk = None
+        while True:
+            chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            chunk = list(chunk_queryset[:chunk_size])
+            for item in chunk:
+                yield item
+            if len(chunk) < chunk_size:
+                break
+            last_pk = chunk[-1].pk
+
+    def iter_rows(self, items):
+        """
+        Yields (item, columns data) for each item.
+
+        With DEBUG enabled, columns that run a query per row are logged.
+        """
+        list_columns = [(field_name, self.get_column(field_name)) for field_name in self.list_display]
+
+        connection = connections[self.queryset.db]
+        if not (settings.DEBUG and connection.queries_logged):
+            for item in items:
+                columns = OrderedDict()
+                for field_name, attr in list_columns:
+                    columns[field_name] = smart_text(attr.get_value(item))
+                yield item, columns
+            return
+
+        rows_count, column_queries = 0, defaultdict(int)
+        for item in items:
             columns = OrderedDict()
-            for n, field_name in enumerate(self.list_display):
-                attr = self.get_data_attr(field_name)
+            for field_name, attr in list_columns:
+                queries_count = len(connection.queries_log)
                 columns[field_name] = smart_text(attr.get_value(item))
+                column_queries[field_name] += len(connection.queries_log) - queries_count
+            rows_count += 1
             yield item, columns
+
+        for field_name, _ in list_columns:
+            if rows_count and column_queries[field_name] >= rows_count:
+                logger.warning(
+                    "%s column '%s' runs %d queries for %d rows, use select_related or prefetch_related",
+                    self.model._meta.object_name, field_name, column_queries[field_name], rows_count)
+
+    def get_data(self, start, length, cursor=None, iterator=False):
+        """
+        Yields (item, columns data) for the page rows.
+
+        `iterator` - fetch rows with queryset.iterator(), without the
+        queryset cache, to keep memory flat for the large pages.
+        The `has_more`, `page_end` and `next_cursor` are set when all
+        rows are consumed.
+        """
+        queryset, ordering = self.get_page_queryset(start, length, cursor=cursor)
+        self.has_more, self.next_cursor = False, None
+
+        def page_items():
+            count, last_item = 0, None
+            for item in (queryset.iterator() if iterator else queryset):
+                if count == length:
+                    self.has_more = True
+                    break
+                count, last_item = count + 1, item
+                yield item
+
+            self.page_end = start + count
+            if self.has_more and ordering is not None and last_item is not None:
+                self.next_cursor = self.encode_cursor(ordering, last_item)
+
+        for row in self.iter_rows(page_items()):
+            yield row
@@ -1,8 +1,43 @@
+import re
+
 from django import forms
 from django.forms import BaseFormSet
 
 
 class DatatableRequestForm(forms.Form):
+    """
+    DataTables server-side processing request.
+
+    `ordering` in the cleaned data is a list of (column index,
+    descending) pairs. `cursor` is the keyset pagination position
+    of the requested page.
+    """
+    ORDER_RE = re.compile(r'^order\[(\d+)\]\[column\]$')
+
     draw = forms.IntegerField()
     start = forms.IntegerField()
     length = forms.IntegerField()
+    cursor = forms.CharField(required=False)
+
+    def __init__(self, *args, **kwargs):
+        super(DatatableRequestForm, self).__init__(*args, **kwargs)
+        self.fields['search[value]'] = forms.CharField(required=False)
+
+    def clean(self):
+        cleaned_data = super(DatatableRequestForm, self).clean()
+        cleaned_data['search'] = cleaned_data.pop('search[value]', '').strip()
+
+        ordering = []
+        for key in self.data:
+            match = self.ORDER_RE.match(key)
+            if match is None:
+                continue
+            try:
+                column = int(self.data[key])
+            except ValueError:
+                continue
+            descending = self.data.get('order[{}][dir]'.format(match.group(1))) == 'desc'
+            ordering.append((int(match.group(1)), column, descending))
+        cleaned_data['ordering'] = [(column, descending) for _, column, descending in sorted(ordering)]
+
+        return cleaned_data
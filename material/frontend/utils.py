@@ -1,6 +1,61 @@
+from weakref import WeakKeyDictionary
+
 from django.db import router
-from django.core.urlresolvers import NoReverseMatch, reverse
+from django.core.urlresolvers import (
+    NoReverseMatch, get_resolver, get_script_prefix, get_urlconf, reverse)
 from django.db.models.deletion import Collector
+from django.utils import six, translation
+
+
+# A pk value unlikely to be a part of an url anywhere else
+_PK_PLACEHOLDER = 7070707070707070707
+
+# resolver -> {(viewname, script_prefix, language): (url_prefix, url_suffix) or None}
+_pk_url_templates = WeakKeyDictionary()
+
+
+def _get_pk_url_template(viewname):
+    templates = _pk_url_templates.setdefault(get_resolver(get_urlconf()), {})
+    key = (viewname, get_script_prefix(), translation.get_language())
+
+    if key not in templates:
+        template = None
+        try:
+            url = reverse(viewname, args=[_PK_PLACEHOLDER])
+        except NoReverseMatch:
+            pass
+        else:
+            parts = url.split(str(_PK_PLACEHOLDER))
+            if len(parts) == 2:
+                template = tuple(parts)
+        templates[key] = template
+    return templates[key]
+
+
+def reverse_pk_url(viewname, pk):
+    """
+    Same as `reverse(viewname, args=[pk])`.
+
+    The url is reversed once per url name with a placeholder pk, then
+    integer pks are substituted into it. If the url pattern can't
+    take the placeholder, or the pk is not an integer, it falls back
+    to the `reverse` call.
+    """
+    if isinstance(pk, six.integer_types) and not isinstance(pk, bool) and pk >= 0:
+        template = _get_pk_url_template(viewname)
+        if template is not None:
+            return '{}{}{}'.format(template[0], pk, template[1])
+    return reverse(viewname, args=[pk])
+
+
+def is_overridden(instance, base_cls, name):
+    """
+    True if the `name` method of `base_cls` is redefined by the instance class.
+    """
+    for cls in type(instance).__mro__:
+        if name in cls.__dict__:
+            return cls is not base_cls
+    return False
 
 
 def get_deleted_objects(root):
@@ -12,9 +67,9 @@ def get_deleted_objects(root):
         opts = obj._meta
 
         try:
-            return reverse(
+            return reverse_pk_url(
                 '{}:{}_{}_details'.format(opts.app_label, opts.app_label, opts.model_name),
-                args=[obj._get_pk_val()])
+                obj._get_pk_val())
         except NoReverseMatch:
             return None
 
@@ -1,8 +1,9 @@
-from django.core.urlresolvers import reverse
 from django.core.exceptions import PermissionDenied
 from django.db import models
 from django.views import generic
 
+from ..utils import reverse_pk_url
+
 
 class DetailModelView(generic.DetailView):
     viewset = None
@@ -49,13 +50,11 @@ class DetailModelView(generic.DetailView):
 
         kwargs['object_data'] = self.get_object_data()
         if self.has_change_permission(self.request, self.object):
-            kwargs['change_url'] = reverse(
-                '{}:{}_change'.format(opts.app_label, opts.model_name),
-                args=[self.object.pk])
+            kwargs['change_url'] = reverse_pk_url(
+                '{}:{}_change'.format(opts.app_label, opts.model_name), self.object.pk)
         if self.has_delete_permission(self.request, self.object):
-            kwargs['delete_url'] = reverse(
-                '{}:{}_delete'.format(opts.app_label, opts.model_name),
-                args=[self.object.pk])
+            kwargs['delete_url'] = reverse_pk_url(
+                '{}:{}_delete'.format(opts.app_label, opts.model_name), self.object.pk)
 
         return super(DetailModelView, self).get_context_data(**kwargs)
 
@@ -1,19 +1,31 @@
+import csv
 import json
 
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
-from django.core.urlresolvers import reverse
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models.query import QuerySet
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import six
 from django.utils.decorators import method_decorator
+from django.utils.encoding import force_text
 from django.views.generic import View
 from django.views.generic.base import ContextMixin, TemplateResponseMixin
 
 
 from ..datalist import DataList
+from ..utils import is_overridden, reverse_pk_url
 from .. import forms
 
 
+class _Echo(object):
+    """
+    File-like object that returns the written value, for csv.writer.
+    """
+    def write(self, value):
+        return value
+
+
 class ListModelView(ContextMixin, TemplateResponseMixin, View):
     model = None
     viewset = None
@@ -23,8 +35,23 @@ class ListModelView(ContextMixin, TemplateResponseMixin, View):
     template_name_suffix = '_list'
 
     datalist_class = DataList
+    datalist_counter = None
+    keyset_pagination = False
+    list_select_related = None
+    list_prefetch_related = ()
+    list_only_fields = False
+    json_streaming = False
+    defer_loading = False
+    json_streaming_chunk_size = 100
+    export_formats = ('csv', 'jsonl')
+    export_chunk_size = 1000
+    export_content_types = {
+        'csv': 'text/csv',
+        'jsonl': 'application/x-ndjson',
+    }
     list_display = ('__str__', )
     list_display_links = ()
+    search_fields = ()
 
     datatable_default_config = {
         'processing': False,
@@ -58,6 +85,11 @@ class ListModelView(ContextMixin, TemplateResponseMixin, View):
             return self.viewset.has_change_permission(request, obj)
         raise NotImplementedError('Viewset is not provided')
 
+    def get_view_permissions(self, request, objects):
+        if self.viewset is not None and not is_overridden(self, ListModelView, 'has_view_permission'):
+            return self.viewset.get_view_permissions(request, objects)
+        return [self.has_view_permission(request, obj) for obj in objects]
+
     def get_template_names(self):
         if self.template_name is None:
             opts = self.object_list.model._meta
@@ -70,6 +102,9 @@ class ListModelView(ContextMixin, TemplateResponseMixin, View):
     def get_list_display(self):
         return self.list_display
 
+    def get_search_fields(self):
+        return self.search_fields
+
     def get_list_display_links(self, list_display):
         if self.list_display_links or self.list_display_links is None or not list_display:
             return list(self.list_display_links)
@@ -85,7 +120,13 @@ class ListModelView(ContextMixin, TemplateResponseMixin, View):
             self.object_list,
             data_sources=[self, self.viewset] if self.viewset else [self],
             list_display=list_display,
-            list_display_links=list_display_links
+            list_display_links=list_display_links,
+            search_fields=self.get_search_fields(),
+            counter=self.datalist_counter,
+            keyset_pagination=self.keyset_pagination,
+            select_related=self.list_select_related,
+            prefetch_related=self.list_prefetch_related,
+            only_fields=self.list_only_fields
         )
 
     def get_queryset(self):
@@ -107,17 +148,41 @@ class ListModelView(ContextMixin, TemplateResponseMixin, View):
     def get_datatable_config(self):
         config = self.datatable_default_config.copy()
         config['iDisplayLength'] = self.paginate_by
-        config['columns'] = [{'data': field_name} for field_name in self.datalist.list_display]
+
+        sortable_columns = self.datalist.sortable_columns
+        config['columns'] = [
+            {'data': field_name, 'orderable': field_name in sortable_columns}
+            for field_name in self.datalist.list_display]
+        if sortable_columns:
+            config['ordering'] = True
+            config['order'] = []
+        if self.datalist.search_fields:
+            config['bFilter'] = True
         if self.datatable_config is not None:
             config.update(self.datatable_config)
         return config
 
     def get_context_data(self, **kwargs):
+        """
+        With the `defer_loading` enabled, the first page is rendered
+        into the table with the totals, and datatables skips the
+        initial ajax request.
+        """
         context = super(ListModelView, self).get_context_data(**kwargs)
+
+        rows = self.get_rows(0, self.paginate_by)
+        config = self.get_datatable_config()
+        page_info = None
+        if self.defer_loading:
+            page_info = self.get_json_page_info(0, self.paginate_by)
+            config['deferLoading'] = [page_info['recordsFiltered'], page_info['recordsTotal']]
+
         context.update({
-            'datatable_config': json.dumps(self.get_datatable_config()),
+            'datatable_config': json.dumps(config),
             'headers': self.datalist.get_headers_data(),
-            'data': self.datalist.get_data(0, self.paginate_by),
+            'data': [(item, columns_data) for item, columns_data, _ in rows],
+            'rows': rows,
+            'page_info': json.dumps(page_info, cls=DjangoJSONEncoder),
         })
 
         return context
@@ -126,39 +191,155 @@ class ListModelView(ContextMixin, TemplateResponseMixin, View):
         context = self.get_context_data()
         return self.render_to_response(context)
 
+    def get_items_data(self, items):
+        """
+        Returns get_item_data for the page items, with the view
+        permissions checked at once.
+        """
+        permissions = self.get_view_permissions(self.request, items)
+        self._view_permissions = {item.pk: allowed for item, allowed in zip(items, permissions)}
+        try:
+            return [self.get_item_data(item) for item in items]
+        finally:
+            self._view_permissions = {}
+
     def get_item_data(self, item):
         opts = self.model._meta
 
+        view_permissions = getattr(self, '_view_permissions', {})
+        if item.pk in view_permissions:
+            allowed = view_permissions[item.pk]
+        else:
+            allowed = self.has_view_permission(self.request, item)
+
         result = {}
-        if self.has_view_permission(self.request, item):
-            result['view_url'] = reverse(
-                '{}:{}_detail'.format(opts.app_label, opts.model_name),
-                args=[item.pk])
+        if allowed:
+            result['view_url'] = reverse_pk_url(
+                '{}:{}_detail'.format(opts.app_label, opts.model_name), item.pk)
         return result
 
+    def get_rows(self, start, length, cursor=None):
+        """
+        List of (item, columns_data, item_data) for the page.
+        """
+        rows = list(self.datalist.get_data(start, length, cursor=cursor))
+        items_data = self.get_items_data([item for item, _ in rows])
+        return [
+            (item, columns_data, item_data)
+            for (item, columns_data), item_data in zip(rows, items_data)]
+
+    def get_json_page_info(self, start, length):
+        """
+        Totals and the next page cursor, available after the page rows
+        are fetched.
+        """
+        data = {
+            "recordsTotal": self.datalist.total(),
+            "recordsFiltered": self.datalist.total_filtered(),
+        }
+        if self.datalist.next_cursor:
+            data.update({
+                "cursor": self.datalist.next_cursor,
+                "cursor_start": start + length,
+            })
+        return data
+
+    def stream_json_data(self, draw, start, length, cursor):
+        """
+        Yields the json response, rows are encoded as they are fetched.
+
+        Rows are fetched with queryset.iterator(), so the
+        list_prefetch_related lookups are not applied.
+        """
+        encoder = DjangoJSONEncoder()
+
+        yield '{{"draw": {}, "data": ['.format(encoder.encode(draw))
+
+        def encode_chunk(rows):
+            items_data = self.get_items_data([item for item, _ in rows])
+            for (_, columns_data), item_data in zip(rows, items_data):
+                columns_data.update(item_data)
+            return ', '.join(encoder.encode(columns_data) for _, columns_data in rows)
+
+        chunk, separator = [], ''
+        for row in self.datalist.get_data(start, length, cursor=cursor, iterator=True):
+            chunk.append(row)
+            if len(chunk) == self.json_streaming_chunk_size:
+                yield separator + encode_chunk(chunk)
+                chunk, separator = [], ', '
+        if chunk:
+            yield separator + encode_chunk(chunk)
+
+        page_info = encoder.encode(self.get_json_page_info(start, length))
+        yield '], ' + page_info[1:]
+
     def get_json_data(self, request, *args, **kwargs):
         form = forms.DatatableRequestForm(request.GET)
         if not form.is_valid():
-            return {'error': form.errors}
+            return JsonResponse({'error': form.errors}, status=400)
 
         draw = form.cleaned_data['draw']
         start = form.cleaned_data['start']
         length = form.cleaned_data['length']
+        cursor = form.cleaned_data['cursor']
+
+        list_display = list(self.datalist.list_display)
+        self.datalist.set_filter(form.cleaned_data['search'])
+        self.datalist.set_ordering([
+            (list_display[column], descending)
+            for column, descending in form.cleaned_data['ordering']
+            if 0 <= column < len(list_display)])
+
+        if self.json_streaming:
+            return StreamingHttpResponse(
+                self.stream_json_data(draw, start, length, cursor),
+                content_type='application/json')
 
         result = []
-        for item, columns_data in self.datalist.get_data(start, length):
-            columns_data.update(self.get_item_data(item))
+        for item, columns_data, item_data in self.get_rows(start, length, cursor=cursor):
+            columns_data.update(item_data)
             result.append(columns_data)
 
         data = {
             "draw": draw,
-            "recordsTotal": self.datalist.total(),
-            "recordsFiltered": self.datalist.total_filtered(),
             "data": result
         }
-
+        data.update(self.get_json_page_info(start, length))
         return JsonResponse(data)
 
+    def stream_csv_export(self):
+        writer = csv.writer(_Echo())
+
+        def encode(values):
+            values = [force_text(value) for value in values]
+            if six.PY2:
+                values = [value.encode('utf-8') for value in values]
+            return values
+
+        yield writer.writerow(encode(label for _, label in self.datalist.get_headers_data()))
+        for _, columns_data in self.datalist.iter_rows(self.datalist.iter_items(self.export_chunk_size)):
+            yield writer.writerow(encode(columns_data.values()))
+
+    def stream_jsonl_export(self):
+        encoder = DjangoJSONEncoder()
+        for _, columns_data in self.datalist.iter_rows(self.datalist.iter_items(self.export_chunk_size)):
+            yield encoder.encode(columns_data) + '\n'
+
+    def get_export(self, request, *args, **kwargs):
+        """
+        Stream the whole list, filtered by the `q` search term, as CSV
+        or JSON lines.
+        """
+        export_format = request.GET['_export']
+        self.datalist.set_filter(request.GET.get('q', '').strip())
+
+        response = StreamingHttpResponse(
+            getattr(self, 'stream_{}_export'.format(export_format))(),
+            content_type=self.export_content_types.get(export_format, 'application/octet-stream'))
+        response['Content-Disposition'] = 'attachment; filename="{}.{}"'.format(
+            self.model._meta.model_name, export_format)
+        return response
+
     @method_decorator(login_required)
     def dispatch(self, request, *args, **kwargs):
         if not self.has_view_permission(self.request):
@@ -167,7 +348,9 @@ class ListModelView(ContextMixin, TemplateResponseMixin, View):
         self.object_list = self.get_queryset()
         self.datalist = self.create_datalist()
 
-        if request.is_ajax() and not request.META.get("PJAX", False):
+        if request.method == 'GET' and request.GET.get('_export') in self.export_formats:
+            handler = self.get_export
+        elif request.is_ajax() and not request.META.get("PJAX", False):
             handler = self.get_json_data
         elif request.method.lower() in self.http_method_names:
             handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
@@ -1,6 +1,14 @@
 from django.conf.urls import url
-from django.contrib.auth import get_permission_codename
+from django.contrib.auth import get_backends, get_permission_codename
+from django.contrib.auth.backends import ModelBackend
 
+try:
+    from django.contrib.auth.backends import AllowAllUsersModelBackend
+except ImportError:
+    # django < 1.10
+    AllowAllUsersModelBackend = ModelBackend
+
+from ..utils import is_overridden
 from .create import CreateModelView
 from .delete import DeleteModelView
 from .detail import DetailModelView
@@ -11,6 +19,16 @@ from .update import UpdateModelView
 DEFAULT = object()
 
 
+def _object_permissions_supported():
+    """
+    The django ModelBackend denies any object permission, other
+    backends, including the ModelBackend subclasses, may check them.
+    """
+    return not all(
+        type(backend) in (ModelBackend, AllowAllUsersModelBackend)
+        for backend in get_backends())
+
+
 class ModelViewSet(object):
     model = None
 
@@ -23,6 +41,15 @@ class ModelViewSet(object):
     queryset = DEFAULT
     list_display = DEFAULT
     list_display_links = DEFAULT
+    search_fields = DEFAULT
+    datalist_counter = DEFAULT
+    keyset_pagination = DEFAULT
+    list_select_related = DEFAULT
+    list_prefetch_related = DEFAULT
+    list_only_fields = DEFAULT
+    json_streaming = DEFAULT
+    defer_loading = DEFAULT
+    export_formats = DEFAULT
 
     layout = DEFAULT
     form_class = DEFAULT
@@ -32,27 +59,58 @@ class ModelViewSet(object):
                 if hasattr(view_class, name)
                 if value is not DEFAULT}
 
-    def has_add_permission(self, request):
+    def has_perm(self, request, action, obj=None):
+        """
+        Check the model permission, results are memoised per request.
+        """
         opts = self.model._meta
-        codename = get_permission_codename('add', opts)
-        return request.user.has_perm('{}.{}'.format(opts.app_label, codename))
+        perm = '{}.{}'.format(opts.app_label, get_permission_codename(action, opts))
+
+        user = request.user
+        cache = request.__dict__.setdefault('_material_permissions', {})
+        key = (user.__class__, user.pk, perm, None if obj is None else (obj.__class__, obj.pk))
+        if key not in cache:
+            cache[key] = user.has_perm(perm, obj=obj)
+        return cache[key]
+
+    def has_add_permission(self, request):
+        return self.has_perm(request, 'add')
 
     def has_view_permission(self, request, obj=None):
-        opts = self.model._meta
-        codename = get_permission_codename('view', opts)
-        if request.user.has_perm('{}.{}'.format(opts.app_label, codename), obj=obj):
+        if self.has_perm(request, 'view', obj=obj):
             return True
         return self.has_change_permission(request, obj=obj)
 
     def has_change_permission(self, request, obj=None):
-        opts = self.model._meta
-        codename = get_permission_codename('change', opts)
-        return request.user.has_perm('{}.{}'.format(opts.app_label, codename), obj=obj)
+        return self.has_perm(request, 'change', obj=obj)
 
     def has_delete_permission(self, request, obj=None):
-        opts = self.model._meta
-        codename = get_permission_codename('delete', opts)
-        return request.user.has_perm('{}.{}'.format(opts.app_label, codename), obj=obj)
+        return self.has_perm(request, 'delete', obj=obj)
+
+    def get_view_permissions(self, request, objects):
+        """
+        Bulk has_view_permission check, returns a list of booleans.
+
+        Unless the permission methods are overridden, active superusers
+        are allowed and inactive users are denied without backend calls,
+        and if none of the authentication backends checks object
+        permissions, the first object result is reused for the whole
+        list. Override to use a backend bulk api.
+        """
+        objects = list(objects)
+        user = request.user
+        if not objects:
+            return []
+        elif any(is_overridden(self, ModelViewSet, name)
+                 for name in ['has_perm', 'has_view_permission', 'has_change_permission']):
+            return [self.has_view_permission(request, obj) for obj in objects]
+        elif user.is_active and user.is_superuser:
+            return [True] * len(objects)
+        elif not user.is_active:
+            return [False] * len(objects)
+        elif not _object_permissions_supported():
+            return [self.has_view_permission(request, objects[0])] * len(objects)
+        return [self.has_view_permission(request, obj) for obj in objects]
 
     def get_common_kwargs(self, **kwargs):
         result = {
@@ -77,7 +135,16 @@ class ModelViewSet(object):
     def get_list_view_kwargs(self, **kwargs):
         result = {
             'list_display': self.list_display,
-            'list_display_links': self.list_display_links
+            'list_display_links': self.list_display_links,
+            'search_fields': self.search_fields,
+            'datalist_counter': self.datalist_counter,
+            'keyset_pagination': self.keyset_pagination,
+            'list_select_related': self.list_select_related,
+            'list_prefetch_related': self.list_prefetch_related,
+            'list_only_fields': self.list_only_fields,
+            'json_streaming': self.json_streaming,
+            'defer_loading': self.defer_loading,
+            'export_formats': self.export_formats,
         }
         result.update(kwargs)
 
@@ -0,0 +1,133 @@
+"""
+Form rendering profiler.
+
+Collects per-request timings of {% form %}, {% render %}, layout
+nodes, fields and field templates lookups.
+
+Enable with `MATERIAL_RENDER_PROFILE = True` setting and add
+`material.profiling.RenderProfileMiddleware` to the middleware
+list. Collected timings are logged by the `material.profiling`
+logger and sent with the `render_profiled` signal, ex: to be shown
+in a debug panel.
+
+Outside of the request/response cycle, use::
+
+    with render_profile() as profile:
+        template.render(context)
+    print(profile.stats())
+"""
+import functools
+import logging
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from timeit import default_timer
+
+from django.conf import settings
+from django.dispatch import Signal
+
+from .compat import MiddlewareMixin
+
+
+__all__ = [
+    'RenderProfile', 'RenderProfileMiddleware', 'render_profile',
+    'render_profiled', 'profiled'
+]
+
+logger = logging.getLogger('material.profiling')
+
+render_profiled = Signal(providing_args=['request', 'profile'])
+
+_state = threading.local()
+
+
+class RenderProfile(object):
+    """
+    Aggregated render timings, (kind, name) -> calls count and total time.
+
+    Timings are inclusive, ex: a form time contains all of its fields
+    render time.
+    """
+    def __init__(self):
+        self.timings = defaultdict(lambda: [0, 0.0])
+
+    def add(self, kind, name, duration):
+        timing = self.timings[(kind, name)]
+        timing[0] += 1
+        timing[1] += duration
+
+    def stats(self):
+        """
+        Returns list of (kind, name, count, total_seconds), slowest first.
+        """
+        return sorted(
+            ((kind, name, count, total) for (kind, name), (count, total) in self.timings.items()),
+            key=lambda stat: stat[3], reverse=True)
+
+
+def get_profile():
+    return getattr(_state, 'profile', None)
+
+
+def start_profile():
+    _state.profile = RenderProfile()
+    return _state.profile
+
+
+def stop_profile():
+    profile = get_profile()
+    _state.profile = None
+    return profile
+
+
+@contextmanager
+def render_profile():
+    profile = start_profile()
+    try:
+        yield profile
+    finally:
+        stop_profile()
+
+
+def profiled(kind, get_name):
+    """
+    Record the decorated function execution time under (kind, name).
+
+    `get_name` receives the function arguments. Unless a profile
+    is active for the current thread, the function is called directly.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = getattr(_state, 'profile', None)
+            if profile is None:
+                return func(*args, **kwargs)
+
+            name = get_name(*args, **kwargs)
+            start = default_timer()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.add(kind, name, default_timer() - start)
+        return wrapper
+    return decorator
+
+
+class RenderProfileMiddleware(MiddlewareMixin):
+    """
+    Collect form rendering timings per request.
+    """
+    def process_request(self, request):
+        if getattr(settings, 'MATERIAL_RENDER_PROFILE', False):
+            start_profile()
+
+    def process_response(self, request, response):
+        profile = stop_profile()
+        if profile is not None and profile.timings:
+            render_profiled.send(sender=self.__class__, request=request, profile=profile)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Form render profile for %s\n%s', request.path, '\n'.join(
+                    '{} {}: {} calls, {:.2f}ms'.format(kind, name, count, total * 1000)
+                    for kind, name, count, total in profile.stats()))
+        return response
@@ -1,8 +1,106 @@
 $(document).on('ready pjax:complete', function() {
+    /*
+      Select with choices loaded page by page from the
+      `data-url` json endpoint, see material.views.RemoteChoicesView
+    */
+    function remote_select_init(select) {
+        var multiple = select.prop('multiple'),
+            input = $('<input type="text" class="select-dropdown" autocomplete="off"/>'),
+            list = $('<ul class="dropdown-content select-dropdown remote-select-dropdown"></ul>'),
+            term = null, page = 1, more = false, request = null, timer = null;
+
+        function selected_text() {
+            return select.find('option:selected').filter(function() {
+                return this.value !== '';
+            }).map(function() {
+                return $(this).text();
+            }).get().join(', ');
+        }
+
+        function load(reset) {
+            if(request) {
+                request.abort();
+            }
+            if(reset) {
+                page = 1;
+                list.empty();
+            }
+            request = $.getJSON(select.data('url'), {q: term, page: page}, function(data) {
+                $.each(data.results, function(index, choice) {
+                    var option = select.find('option').filter(function() {
+                        return this.value === String(choice.id);
+                    });
+                    $('<li><span></span></li>')
+                        .toggleClass('active', option.prop('selected') === true)
+                        .data('choice', choice)
+                        .find('span').text(choice.text).end()
+                        .appendTo(list);
+                });
+                more = data.more;
+                page += 1;
+                request = null;
+            });
+        }
+
+        function choose(choice) {
+            var option = select.find('option').filter(function() {
+                return this.value === String(choice.id);
+            });
+            if(!option.length) {
+                option = $('<option></option>').val(choice.id).text(choice.text).appendTo(select);
+            }
+            if(multiple) {
+                option.prop('selected', !option.prop('selected'));
+            } else {
+                option.prop('selected', true);
+                list.hide();
+            }
+            input.val(selected_text());
+            select.trigger('change');
+        }
+
+        select.hide().before(input).before(list);
+        input.val(selected_text());
+
+        input.on('focus', function() {
+            term = '';
+            input.val('');
+            list.css({display: 'block', opacity: 1, width: input.outerWidth()});
+            load(true);
+        }).on('input', function() {
+            clearTimeout(timer);
+            timer = setTimeout(function() {
+                term = input.val();
+                load(true);
+            }, 250);
+        }).on('blur', function() {
+            setTimeout(function() {
+                list.hide();
+                input.val(selected_text());
+            }, 200);
+        });
+
+        list.on('mousedown', 'li', function(event) {
+            event.preventDefault();
+            if(!multiple) {
+                $(this).siblings().removeClass('active');
+            }
+            $(this).toggleClass('active', multiple ? undefined : true);
+            choose($(this).data('choice'));
+        }).on('scroll', function() {
+            if(more && !request && list.scrollTop() + list.innerHeight() >= list[0].scrollHeight - 20) {
+                load(false);
+            }
+        });
+    }
+
     function material_init($container) {
         $container.find('.dropdown-button.constrain_width').dropdown({hover: false, constrain_width: true});
         $container.find('.dropdown-button').not('.constrain_width').dropdown({hover: false, constrain_width: false});
-        $container.find('select').not('.disabled').not('.material-ignore').material_select();
+        $container.find('select').not('.disabled').not('.material-ignore').not('[data-form-control="remote-select"]').material_select();
+        $container.find('select[data-form-control="remote-select"]').each(function() {
+            remote_select_init($(this));
+        });
 
         $container.find('[data-form-control="date"]').each(function() {
             var input = $(this);
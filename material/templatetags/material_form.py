@@ -1,17 +1,27 @@
+import hashlib
 import os
 import re
+import weakref
 from collections import defaultdict
+from copy import copy
+from itertools import chain
 
-from django.forms.utils import flatatt
+from django.conf import settings
+from django.core.cache import caches
 from django.forms.forms import BoundField
 from django.template import Library
 from django.template.base import (
-    TemplateSyntaxError, Node, Variable, token_kwargs)
+    TOKEN_BLOCK, TemplateSyntaxError, Node, TextNode, Variable, token_kwargs)
 from django.template.loader import get_template
 from django.template.loader_tags import IncludeNode
-from django.utils.safestring import mark_safe
+from django.utils import translation
+from django.utils.encoding import force_bytes, force_text
+from django.utils.html import conditional_escape
+from django.utils.safestring import SafeText, mark_safe
 
+from ..base import Layout
 from ..compat import context_flatten
+from ..profiling import profiled
 
 
 register = Library()
@@ -19,14 +29,217 @@ register = Library()
 ATTRS_RE = re.compile(r'(?P<attr>[-\w]+)(\s*=\s*[\'"](?P<val>.*?)[\'"])?', re.MULTILINE | re.DOTALL)
 
 
-def _render_parts(context, parts_list):
+def _flatatt(attrs):
+    """
+    Same output as django 1.10+ django.forms.utils.flatatt, with a single string join.
+    """
+    key_value_attrs, boolean_attrs = [], []
+    for attr, value in attrs.items():
+        if isinstance(value, bool):
+            if value:
+                boolean_attrs.append(attr)
+        elif value is not None:
+            key_value_attrs.append((attr, value))
+
+    return SafeText(''.join(
+        [' ' + conditional_escape(attr) + '="' + conditional_escape(value) + '"'
+         for attr, value in sorted(key_value_attrs)] +
+        [' ' + conditional_escape(attr) for attr in sorted(boolean_attrs)]))
+
+
+def _compile_attrs(nodelist):
+    """
+    Split {% attrs %} content into attributes at template parse time.
+
+    Returns a list of (attr, value) items, where value is
+     - a static value: safe string or True for an attribute without value,
+     - a list of strings and nodes, for a value with template variables or tags,
+     - or attr is None and value is a node, that renders some attributes, ex: {% if %}
+
+    Returns None, if the content can't be split before rendering.
+    """
+    placeholder = '\x00'
+    source, nodes = [], []
+    for node in nodelist:
+        if isinstance(node, TextNode):
+            if placeholder in node.s:
+                return None
+            source.append(node.s)
+        else:
+            source.append(placeholder)
+            nodes.append(node)
+    source = ''.join(source)
+    nodes = iter(nodes)
+
+    def collect_gap(text, start, end):
+        # only whitespaces and standalone nodes are allowed between attributes
+        for pos in range(start, end):
+            char = text[pos]
+            if char == placeholder:
+                before = text[pos - 1] if pos > 0 else ' '
+                after = text[pos + 1] if pos + 1 < len(text) else ' '
+                if not (before.isspace() or before in '\'"') or not after.isspace():
+                    return False
+                items.append((None, next(nodes)))
+            elif not char.isspace():
+                return False
+        return True
+
+    items, pos = [], 0
+    for match in ATTRS_RE.finditer(source):
+        if not collect_gap(source, pos, match.start()):
+            return None
+        pos = match.end()
+
+        attr, value = match.group('attr'), match.group('val') or ''
+        if placeholder not in value:
+            items.append((attr, mark_safe(value) if value != '' else True))
+        else:
+            value_parts = []
+            for n, text in enumerate(value.split(placeholder)):
+                if n > 0:
+                    value_parts.append(next(nodes))
+                if text:
+                    value_parts.append(text)
+            items.append((attr, value_parts))
+
+    if not collect_gap(source + ' ', pos, len(source)):
+        return None
+
+    return items
+
+
+class LazyPart(object):
+    """
+    Part override, rendered on the first lookup.
+
+    The context is a shallow copy of the context stack at the override
+    place, so the part is rendered with the same variables.
+    """
+    def __init__(self, node, context):
+        self.node = node
+        self.context = context
+
+    def render(self):
+        return self.node.render_content(self.context)
+
+
+def _render_parts(context, parts_list, snapshot=None):
     parts = context['form_parts']
 
     for partnode in parts_list:
         part = partnode.resolve_part(context)
         if partnode.section not in parts[part]:
-            value = partnode.render(context)
-            parts[part][partnode.section] = value
+            if snapshot is None:
+                snapshot = copy(context)
+            parts[part][partnode.section] = LazyPart(partnode, snapshot)
+            # nested overrides are available before the part is rendered
+            _render_parts(context, partnode.part_nodes, snapshot=snapshot)
+
+
+def _get_part(parts, part, section):
+    value = parts[part][section]
+    if isinstance(value, LazyPart):
+        value = parts[part][section] = value.render()
+    return value
+
+
+def _nodelist_index(nodelist):
+    """
+    Returns (part_nodes, attr_nodes, include_nodes) direct children of the nodelist.
+    """
+    return (
+        [node for node in nodelist if isinstance(node, FormPartNode)],
+        [node for node in nodelist if isinstance(node, WidgetAttrNode)],
+        [node for node in nodelist if isinstance(node, IncludeNode)],
+    )
+
+
+_included_index = weakref.WeakKeyDictionary()  # template -> nodelist index
+
+
+def _get_included_index(context, include_node):
+    template = include_node.template.resolve(context)
+    if not hasattr(template, 'render'):
+        template = get_template(template)
+    if hasattr(template, 'template'):
+        # backend template
+        template = template.template
+
+    try:
+        return _included_index[template]
+    except KeyError:
+        index = _included_index[template] = _nodelist_index(template.nodelist)
+        return index
+
+
+def _tag_source_digest(token, tokens):
+    """
+    Digest of the tag source, from the opening `token` to the closing
+    tag in the not yet parsed `tokens`.
+
+    Tokens are hashed in place, so the template source is not kept.
+    """
+    tag_name = token.contents.split()[0]
+    end_tag_name = 'end{}'.format(tag_name)
+
+    source, depth = hashlib.md5(), 0
+    for token in chain([token], tokens):
+        source.update(force_bytes('{}:{}\x00'.format(token.token_type, token.contents)))
+        if token.token_type != TOKEN_BLOCK or not token.contents:
+            continue
+        name = token.contents.split()[0]
+        if name == tag_name:
+            depth += 1
+        elif name == end_tag_name:
+            depth -= 1
+            if depth == 0:
+                break
+    return source.hexdigest()
+
+
+def _get_form_cache_key(node, form, layout, template_name):
+    """
+    Cache key for an unbound form render output.
+
+    Returns None if the form could not be safely cached.
+    """
+    token, origin = getattr(node, 'token', None), getattr(node, 'origin', None)
+    source_digest = getattr(node, 'source_digest', None)
+    if token is None or origin is None or source_digest is None:
+        return None
+
+    if layout is None:
+        layout_signature = ''
+    elif isinstance(layout, Layout):
+        layout_signature = layout.signature
+    else:
+        return None
+
+    form_cls = type(form)
+    key = '|'.join(force_text(value) for value in [
+        form_cls.__module__, form_cls.__name__, form.prefix, form.auto_id,
+        layout_signature, template_name,
+        origin.name, token.lineno, source_digest,
+        translation.get_language()
+    ])
+    return 'material.form.{}.{}'.format(
+        getattr(settings, 'MATERIAL_FORM_CACHE_VERSION', 1),
+        hashlib.md5(force_bytes(key)).hexdigest())
+
+
+def _contains_csrf_token(context, html):
+    csrf_token = context.get('csrf_token')
+    if csrf_token is None:
+        return False
+
+    request = context.get('request')
+    if request is not None and not request.META.get('CSRF_COOKIE_USED'):
+        # token never requested, so not rendered
+        return False
+
+    csrf_token = force_text(csrf_token)
+    return csrf_token != 'NOTPROVIDED' and csrf_token in html
 
 
 @register.tag('form')
@@ -39,6 +252,14 @@ class FormNode(Node):
         {% form template='material/form.html' form=form layout=view.layout %}
             {% part form.email prepend %}<span class="input-group-addon" id="basic-addon1">@</span>{% endpart %}
         {% endform %}
+
+    With `cache=True`, the render output of an unbound form is stored
+    in the `MATERIAL_FORM_CACHE` cache (default: 'default'). The cached
+    output is shared between all renders of the same form class, layout,
+    template and language from this tag, so the form initial data and
+    the tag content should not depend on the request. Output containing
+    the CSRF token is never cached. Bump `MATERIAL_FORM_CACHE_VERSION` setting
+    to invalidate the stored forms.
     """
 
     def __init__(self, parser, token):
@@ -52,18 +273,25 @@ class FormNode(Node):
                                       (bits[0], remaining_bits[0]))
 
         for key in self.kwargs:
-            if key not in ('form', 'layout', 'template'):
+            if key not in ('form', 'layout', 'template', 'cache'):
                 raise TemplateSyntaxError("%r received an invalid key: %r" %
                                           (bits[0], key))
 
             self.kwargs[key] = self.kwargs[key]
 
+        self.source_digest = _tag_source_digest(token, parser.tokens)
         self.nodelist = parser.parse(('end{}'.format(bits[0]),))
         parser.delete_first_token()
 
-    def render(self, context):
+        self.part_nodes, self.attr_nodes, self.include_nodes = _nodelist_index(self.nodelist)
+
+    def resolve_form(self, context):
         form = self.kwargs.get('form')
-        form = form.resolve(context) if form else context.get('form')
+        return form.resolve(context) if form else context.get('form')
+
+    @profiled('form', lambda self, context: type(self.resolve_form(context)).__name__)
+    def render(self, context):
+        form = self.resolve_form(context)
 
         if form is None:
             return ''
@@ -82,7 +310,20 @@ class FormNode(Node):
             if hasattr(form, 'layout'):
                 layout = form.layout
 
+        if isinstance(layout, Layout):
+            layout.compile()
+
         template_name = self.kwargs.get('template', 'material/form.html')
+
+        cache, cache_key = None, None
+        if 'cache' in self.kwargs and not form.is_bound and self.kwargs['cache'].resolve(context):
+            cache_key = _get_form_cache_key(self, form, layout, template_name)
+            if cache_key is not None:
+                cache = caches[getattr(settings, 'MATERIAL_FORM_CACHE', 'default')]
+                html = cache.get(cache_key)
+                if html is not None:
+                    return mark_safe(html)
+
         template = get_template(template_name)
 
         # Render form and parts
@@ -97,25 +338,23 @@ class FormNode(Node):
                 form_widget_attrs=attrs):
 
             # direct children
-            children = (node for node in self.nodelist if isinstance(node, FormPartNode))
-            _render_parts(context, children)
-
-            attrs = (node for node in self.nodelist if isinstance(node, WidgetAttrNode))
-            for attr in attrs:
+            _render_parts(context, self.part_nodes)
+            for attr in self.attr_nodes:
                 attr.render(context)
 
             # include
-            children = (node for node in self.nodelist if isinstance(node, IncludeNode))
-            for included_list in children:
-                included = included_list.template.resolve(context)
-                children = (node for node in included.nodelist if isinstance(node, FormPartNode))
-                _render_parts(context, children)
-
-                attrs = (node for node in self.nodelist if isinstance(node, WidgetAttrNode))
-                for attr in attrs:
+            for include_node in self.include_nodes:
+                part_nodes, attr_nodes, _ = _get_included_index(context, include_node)
+                _render_parts(context, part_nodes)
+                for attr in attr_nodes:
                     attr.render(context)
 
-            return template.render(context_flatten(context))
+            html = template.render(context_flatten(context))
+
+        if cache_key is not None and not _contains_csrf_token(context, html):
+            cache.set(cache_key, html)
+
+        return html
 
 
 @register.tag('part')
@@ -146,6 +385,8 @@ class FormPartNode(Node):
         self.nodelist = parser.parse(('end{}'.format(bits[0]),))
         parser.delete_first_token()
 
+        self.part_nodes = [node for node in self.nodelist if isinstance(node, FormPartNode)]
+
     def resolve_part(self, context):
         part = self.part_id.resolve(context)
         if isinstance(part, BoundField):
@@ -157,16 +398,19 @@ class FormPartNode(Node):
         parts = context['form_parts']
 
         if self.section in parts[part]:
-            # already rendered
+            # overridden
+            value = _get_part(parts, part, self.section)
             if self.varname is not None:
-                context[self.varname.resolve(context)] = parts[part][self.section]
+                context[self.varname.resolve(context)] = value
                 return ""
             else:
-                return parts[part][self.section]
+                return value
 
+        return self.render_content(context)
+
+    def render_content(self, context):
         # child parts
-        children = (node for node in self.nodelist if isinstance(node, FormPartNode))
-        _render_parts(context, children)
+        _render_parts(context, self.part_nodes)
 
         # render own content
         value = self.nodelist.render(context).strip()
@@ -213,6 +457,8 @@ class WidgetAttrsNode(Node):
         self.nodelist = parser.parse(('end{}'.format(bits[0]),))
         parser.delete_first_token()
 
+        self.compiled_attrs = _compile_attrs(self.nodelist)
+
     def resolve_field(self, context):
         field = self.field.resolve(context)
         if isinstance(field, BoundField):
@@ -228,19 +474,19 @@ class WidgetAttrsNode(Node):
         if group in form_widget_attrs[field]:
             override = form_widget_attrs[field][group]
 
-        build_in_attrs, tag_content = {}, self.nodelist.render(context)
-        for attr, _, value in ATTRS_RE.findall(tag_content):
-            build_in_attrs[attr] = mark_safe(value) if value != '' else True
+        if self.compiled_attrs is not None:
+            result = self.render_compiled_attrs(context)
+        else:
+            result = {}
+            for attr, _, value in ATTRS_RE.findall(self.nodelist.render(context)):
+                result[attr] = mark_safe(value) if value != '' else True
 
-        widget_attrs = {}
         if self.widget_attrs is not None:
             widget_attrs = self.widget_attrs.resolve(context)
-
-        result = build_in_attrs.copy()
-
-        if 'class' in result and 'class' in widget_attrs:
-            result['class'] += ' ' + widget_attrs.pop('class')
-        result.update(widget_attrs)
+            if 'class' in result and 'class' in widget_attrs:
+                widget_attrs = widget_attrs.copy()
+                result['class'] += ' ' + widget_attrs.pop('class')
+            result.update(widget_attrs)
 
         for attr, (value, action) in override.items():
             if action == 'override':
@@ -251,7 +497,22 @@ class WidgetAttrsNode(Node):
                 else:
                     result[attr] = value
 
-        return flatatt(result)
+        return _flatatt(result)
+
+    def render_compiled_attrs(self, context):
+        result = {}
+        for attr, value in self.compiled_attrs:
+            if attr is None:
+                for attr, _, value in ATTRS_RE.findall(value.render(context)):
+                    result[attr] = mark_safe(value) if value != '' else True
+            elif isinstance(value, list):
+                value = ''.join(
+                    part.render(context) if isinstance(part, Node) else part
+                    for part in value)
+                result[attr] = mark_safe(value) if value != '' else True
+            else:
+                result[attr] = value
+        return result
 
 
 @register.tag('attr')
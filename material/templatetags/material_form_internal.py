@@ -2,18 +2,21 @@ from __future__ import division
 
 import math
 import re
-from collections import OrderedDict
 
 from django import forms
 from django.forms.forms import BoundField
 from django.template import Library
 from django.template.base import Node, TemplateSyntaxError, Variable, token_kwargs
-from django.utils import formats
+from django.utils import formats, translation
 from django.utils.encoding import force_text
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
 
 from ..base import Field
-from ..widgets import SelectDateWidget
-from .material_form import FormPartNode, WidgetAttrNode, _render_parts
+from ..choices import ChoiceView, get_choices
+from ..profiling import profiled
+from ..widgets import RemoteSelect, SelectDateWidget
+from .material_form import _nodelist_index, _render_parts
 
 
 register = Library()
@@ -47,8 +50,10 @@ class FormRenderNode(Node):
         self.nodelist = parser.parse(('end{}'.format(bits[0]),))
         parser.delete_first_token()
 
+        self.part_nodes, self.attr_nodes, _ = _nodelist_index(self.nodelist)
         self.element = Variable(bits[1])
 
+    @profiled('render', lambda self, context: self.element.var)
     def render(self, context):
         element = self.element.resolve(context)
 
@@ -57,11 +62,8 @@ class FormRenderNode(Node):
             options[key] = value.resolve(context)
 
         # render inner parts
-        children = (node for node in self.nodelist if isinstance(node, FormPartNode))
-        _render_parts(context, children)
-
-        attrs = (node for node in self.nodelist if isinstance(node, WidgetAttrNode))
-        for attr in attrs:
+        _render_parts(context, self.part_nodes)
+        for attr in self.attr_nodes:
             attr.render(context)
 
         # render element
@@ -84,32 +86,69 @@ def multiwidget_value(bound_field, pos):
 
 @register.filter
 def have_default_choice(field):
-    return [choice for choice, _ in field.widget.choices if choice is None or choice == ""]
+    if isinstance(field.widget, RemoteSelect):
+        return [choice for choice, _ in field.widget.selected_choices([]) if choice is None or choice == ""]
+    return [choice for choice, _ in get_choices(field.widget) if choice is None or choice == ""]
+
+
+_DATEPICKER_FORMAT_SUBST = {
+    '%a': 'D',    # Weekday as locale's abbreviated name
+    '%A': 'l',    # Weekday as locale's full name
+    '%w': 'w',    # Weekday as a decimal number, where 0 is Sunday
+    '%d': 'd',    # Day of the month as a zero-padded decimal number
+    '%-d': 'j',   # Day of the month as a decimal number
+    '%b': 'M',    # Month as locale's abbreviated name
+    '%B': 'F',    # Month as locale's full name
+    '%m': 'm',    # Month as a zero-padded decimal number
+    '%-m': 'n',   # Month as a decimal number
+    '%y': 'y',    # Year without century as a zero-padded decimal number
+    '%Y': 'Y',    # Year with century as a decimal number
+    '%H': 'H',    # Hour (24-hour clock) as a zero-padded decimal number
+    '%-H': 'G',   # Hour (24-hour clock) as a decimal number
+    '%I': 'h',    # Hour (12-hour clock) as a zero-padded decimal number
+    '%-I': 'g',   # Hour (12-hour clock) as a decimal number
+    '%p': 'A',    # Locale's equivalent of either AM or PM
+    '%M': 'i',    # Minute as a zero-padded decimal number
+    '%S': 's',    # Second as a zero-padded decimal number
+    '%j': 'z',    # Day of the year as a decimal number
+    '%V': 'W',    # ISO 8601 week number
+    '%z': 'O',    # UTC offset in the form +HHMM or -HHMM
+    '%Z': 'T',    # Time zone name
+    '%x': 'm/d/y',  # C locale's date representation
+    '%X': 'H:i:s',  # C locale's time representation
+    '%%': '%',    # A literal '%' character
+}
+
+# %f, %U, %W and %c are unsupported by the datepicker, left as is
+
+_DATEPICKER_FORMAT_TOKEN_RE = re.compile(r'%-?.|.', re.DOTALL)
+
+# datepicker format characters, should be escaped in literal text
+_DATEPICKER_FORMAT_CHARS = set('dDjlSwzWFmMntLYyaAgGhHisOTZ\\')
+
+_datepicker_formats = {}  # python input format -> datepicker format
+
+
+def _translate_datepicker_format(input_format):
+    result = []
+    for token in _DATEPICKER_FORMAT_TOKEN_RE.findall(input_format):
+        if token in _DATEPICKER_FORMAT_SUBST:
+            result.append(_DATEPICKER_FORMAT_SUBST[token])
+        else:
+            result.extend(
+                '\\' + char if char in _DATEPICKER_FORMAT_CHARS else char
+                for char in token)
+    return ''.join(result)
 
 
 @register.filter
 def jquery_datepicker_format(field):
     input_format = field.input_formats[0]
-
-    # %a, %A, %z, %f %Z %j %U %W %c %x %X unsupported
-
-    subst = {
-        '%d': 'd',    # Day of the month as a zero-padded decimal number
-        '%b': 'M',    # Month as locale's abbreviated name
-        '%B': 'F',    # Month as locale's full name
-        '%m': 'm',    # Month as a zero-padded decimal number
-        '%y': 'y',    # Year without century as a zero-padded decimal number
-        '%Y': 'Y',    # Year with century as a decimal number
-        '%H': 'H',    # Hour (24-hour clock) as a zero-padded decimal number
-        '%I': 'h',    # Hour (12-hour clock) as a zero-padded decimal number
-        '%p': 'a',    # Locale's equivalent of either AM or PM
-        '%M': 'i',    # Minute as a zero-padded decimal number
-        '%S': 's',    # Second as a zero-padded decimal number
-        '%%': '%'     # A literal '%' character
-    }
-
-    return re.sub('|'.join(re.escape(key) for key in subst.keys()),
-                  lambda k: subst[k.group(0)], input_format)
+    try:
+        return _datepicker_formats[input_format]
+    except KeyError:
+        result = _datepicker_formats[input_format] = _translate_datepicker_format(input_format)
+        return result
 
 
 @register.filter
@@ -131,19 +170,20 @@ def split_choices_by_columns(choices, columns):
     return [(col_span, choices[i:i + per_column]) for i in range(0, len(choices), per_column)]
 
 
-@register.filter
-def select_date_widget_wrapper(bound_field):
-    class Wrapper(object):
-        def __init__(self, bound_field):
-            self.bound_field = bound_field
+class SelectDateWidgetWrapper(object):
+    def __init__(self, bound_field):
+        self.bound_field = bound_field
+
+    @property
+    def selects(self):
+        widget = SelectDateWidget(self.bound_field.field.widget)
+        for data in widget.selects_data(self.bound_field.value()):
+            yield data
 
-        @property
-        def selects(self):
-            widget = SelectDateWidget(self.bound_field.field.widget)
-            for data in widget.selects_data(self.bound_field.value()):
-                yield data
 
-    return Wrapper(bound_field)
+@register.filter
+def select_date_widget_wrapper(bound_field):
+    return SelectDateWidgetWrapper(bound_field)
 
 
 @register.filter
@@ -160,6 +200,27 @@ def is_null_boolean_selected(bound_field, value):
     return value == current_value
 
 
+@register.filter
+def choice_view(bound_field):
+    """
+    Returns the bound field `ChoiceView`, choices are processed
+    once per form field.
+
+    Views are stored on the form instance, and released with it.
+    """
+    views = bound_field.form.__dict__.setdefault('_material_choice_views', {})
+    try:
+        return views[bound_field.name]
+    except KeyError:
+        view = views[bound_field.name] = ChoiceView(bound_field)
+        return view
+
+
+@register.filter
+def choice_columns(choice_view, columns):
+    return choice_view.columns(columns)
+
+
 @register.filter
 def select_options(bound_field):
     """
@@ -167,27 +228,92 @@ def select_options(bound_field):
 
     If group_name is None - option is not belongs to group
     """
-    selected = bound_field.value()
-    if not isinstance(selected, (list, tuple)):
-        selected = [selected]
-    selected = set(force_text(v) for v in selected)
+    return [
+        (group, [(label, value, selected) for label, value, selected, _ in items])
+        for group, items in choice_view(bound_field).groups]
+
+
+_options_html_cache = {}  # (language, empty_label, empty_option, choices) -> option html items
+
+
+def _render_option_items(choices, empty_label, empty_option):
+    """
+    Returns list of (value, start_html, end_html) for select options.
 
-    groups = OrderedDict()
-    for option_value, option_label in bound_field.field.widget.choices:
+    Optgroup tags are returned with value None.
+    """
+    def option(option_value, option_label):
+        if option_value is None:
+            option_value = ''
+        value = force_text(option_value)
+
+        if value == '':
+            label = empty_label if empty_label else option_label
+            start = '<option disabled' if empty_option == 'disabled' else '<option value'
+        else:
+            label = option_label
+            start = '<option value="' + conditional_escape(value) + '"'
+        return value, start, '>' + conditional_escape(force_text(label)) + '</option>'
+
+    items = []
+    for option_value, option_label in choices:
         if isinstance(option_label, (list, tuple)):
-            if option_value not in groups:
-                groups[option_value] = []
-            for value, label in option_label:
-                if value is None:
-                    value = ''
-                value = force_text(value)
-                groups[option_value].append((label, value, value in selected))
+            if option_value:
+                items.append((None, '<optgroup label="' + conditional_escape(force_text(option_value)) + '">', ''))
+            items.extend(option(value, label) for value, label in option_label)
+            if option_value:
+                items.append((None, '</optgroup>', ''))
         else:
-            if None not in groups:
-                groups[None] = []
-            if option_value is None:
-                option_value = ''
-            value = force_text(option_value)
-            groups[None].append((option_label, option_value, value in selected))
-
-    return groups.items()
+            items.append(option(option_value, option_label))
+    return items
+
+
+def _get_option_items(choices, empty_label, empty_option):
+    try:
+        key = (translation.get_language(), empty_label, empty_option, tuple(
+            (value, tuple(label) if isinstance(label, (list, tuple)) else label)
+            for value, label in choices))
+        items = _options_html_cache.get(key)
+    except TypeError:
+        # unhashable choice
+        return _render_option_items(choices, empty_label, empty_option)
+
+    if items is None:
+        if len(_options_html_cache) >= 256:
+            _options_html_cache.clear()
+        items = _options_html_cache[key] = _render_option_items(choices, empty_label, empty_option)
+    return items
+
+
+@register.simple_tag(takes_context=True)
+def select_options_html(context, bound_field, empty_option='value'):
+    """
+    Renders <option> tags for the bound field select widget.
+
+    The escaped options html is cached per choices list, only
+    `selected` attributes are added on each render.
+
+    `empty_option` - 'value' renders empty choice with empty value,
+    'disabled' renders it as a disabled option.
+
+    For the `RemoteSelect` widgets only the empty and selected
+    options are rendered, the rest are loaded by the client.
+    """
+    view = choice_view(bound_field)
+    selected = view.selected
+
+    empty_label = context.get('form_select_empty_label')
+    empty_label = force_text(empty_label) if empty_label else None
+
+    if isinstance(bound_field.field.widget, RemoteSelect):
+        items = _render_option_items(view.choices, empty_label, empty_option)
+    else:
+        items = _get_option_items(view.choices, empty_label, empty_option)
+
+    result = []
+    for value, start, end in items:
+        result.append(start)
+        if value is not None and value in selected:
+            result.append(' selected="selected"')
+        result.append(end)
+    return mark_safe(''.join(result))
@@ -0,0 +1,79 @@
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.http import JsonResponse
+from django.utils.encoding import force_text
+from django.views.generic import View
+
+
+class RemoteChoicesView(View):
+    """
+    Paginated and searchable choices for the `RemoteSelect` widgets.
+
+    Responds with `{"results": [{"id": .., "text": ..}], "more": bool}`.
+    The `q` GET parameter is looked up in the `search_fields`, the
+    `page` parameter is 1-based. Total count is never calculated,
+    one extra row is fetched to know if there is a next page.
+
+    The view is not protected by default, wrap it with the
+    `login_required` or a permission check as the data requires.
+    """
+    model = None
+    queryset = None
+    search_fields = ()
+    paginate_by = 20
+    to_field_name = None
+
+    def get_queryset(self):
+        if self.queryset is not None:
+            queryset = self.queryset
+            if isinstance(queryset, QuerySet):
+                queryset = queryset.all()
+        elif self.model is not None:
+            queryset = self.model._default_manager.all()
+        else:
+            raise ImproperlyConfigured(
+                "%(cls)s is missing a QuerySet. Define "
+                "%(cls)s.model, %(cls)s.queryset, or override "
+                "%(cls)s.get_queryset()." % {
+                    'cls': self.__class__.__name__
+                })
+        if not queryset.ordered:
+            queryset = queryset.order_by('pk')
+        return queryset
+
+    def search(self, queryset, term):
+        if not term or not self.search_fields:
+            return queryset
+        return queryset.filter(reduce(or_, (
+            Q(**{'{}__icontains'.format(field_name): term})
+            for field_name in self.search_fields)))
+
+    def get_page(self):
+        try:
+            return max(int(self.request.GET.get('page', 1)), 1)
+        except ValueError:
+            return 1
+
+    def get_choice_value(self, obj):
+        return force_text(getattr(obj, self.to_field_name) if self.to_field_name else obj.pk)
+
+    def get_choice_label(self, obj):
+        return force_text(obj)
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.search(self.get_queryset(), request.GET.get('q', '').strip())
+
+        start = (self.get_page() - 1) * self.paginate_by
+        objects = list(queryset[start:start + self.paginate_by + 1])
+
+        return JsonResponse({
+            'results': [
+                {'id': self.get_choice_value(obj), 'text': self.get_choice_label(obj)}
+                for obj in objects[:self.paginate_by]
+            ],
+            'more': len(objects) > self.paginate_by,
+        })
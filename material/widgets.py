@@ -1,9 +1,16 @@
 import datetime
 
 from django.conf import settings
-from django.utils import formats, six
-from django.forms.widgets import Widget
-from django.utils.encoding import force_str
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
+from django.forms.widgets import Select, SelectMultiple, Widget
+from django.utils import formats, six, translation
+from django.utils.encoding import force_str, force_text
+
+
+_select_date_choices = {}  # (type, language, required, none value, source key) -> (source, choices)
+
+_date_fields_order = {}  # DATE_FORMAT -> ('year', 'month', 'day') ordered
 
 
 class SelectDateWidget(Widget):
@@ -38,7 +45,7 @@ class SelectDateWidget(Widget):
                     except ValueError:
                         pass
                 else:
-                    match = self.re_date.match(value)
+                    match = self.date_re.match(value)
                     if match:
                         year_val, month_val, day_val = [int(v) for v in match.groups()]
 
@@ -46,6 +53,12 @@ class SelectDateWidget(Widget):
 
     def parse_date_fmt(self):
         fmt = formats.get_format('DATE_FORMAT')
+        try:
+            return _date_fields_order[fmt]
+        except KeyError:
+            pass
+
+        fields = []
         escaped = False
         for char in fmt:
             if escaped:
@@ -53,20 +66,48 @@ class SelectDateWidget(Widget):
             elif char == '\\':
                 escaped = True
             elif char in 'Yy':
-                yield 'year'
+                fields.append('year')
             elif char in 'bEFMmNn':
-                yield 'month'
+                fields.append('month')
             elif char in 'dj':
-                yield 'day'
+                fields.append('day')
+
+        fields = _date_fields_order[fmt] = tuple(fields)
+        return fields
 
     def none_choice(self, none_value):
         return [] if self.widget.is_required else [none_value]
 
+    def get_choices(self, select_type, none_value, source, source_key, get_values):
+        """
+        Returns select choices, cached per source and the current language.
+        """
+        try:
+            key = (select_type, translation.get_language(), self.widget.is_required, none_value, source_key)
+            # the source is kept in the cache, so its id can't be reused
+            return _select_date_choices[key][1]
+        except TypeError:
+            # unhashable none value
+            return self.none_choice(none_value) + get_values(source)
+        except KeyError:
+            if len(_select_date_choices) >= 256:
+                _select_date_choices.clear()
+            choices = self.none_choice(none_value) + get_values(source)
+            _select_date_choices[key] = (source, choices)
+            return choices
+
     def selects_data(self, value):
         year_val, month_val, day_val = self.split_value(value)
-        year_choices = self.none_choice(self.widget.year_none_value) + [(i, i) for i in self.widget.years]
-        month_choices = self.none_choice(self.widget.month_none_value) + list(six.iteritems(self.widget.months))
-        day_choices = self.none_choice(self.widget.day_none_value) + [(i, i) for i in range(1, 32)]
+        years = tuple(self.widget.years)
+        year_choices = self.get_choices(
+            'year', self.widget.year_none_value, years, years,
+            lambda years: [(i, i) for i in years])
+        month_choices = self.get_choices(
+            'month', self.widget.month_none_value, self.widget.months, id(self.widget.months),
+            lambda months: [(month, force_text(name)) for month, name in six.iteritems(months)])
+        day_choices = self.get_choices(
+            'day', self.widget.day_none_value, None, None,
+            lambda _: [(i, i) for i in range(1, 32)])
 
         data = {
             'year': {'type': 'year', 'value': year_val, 'choices': year_choices},
@@ -76,3 +117,63 @@ class SelectDateWidget(Widget):
 
         for field in self.parse_date_fmt():
             yield data[field]
+
+
+class RemoteSelect(Select):
+    """
+    Select with choices loaded from a JSON endpoint.
+
+    Only the empty and selected options are rendered server-side, so
+    the widget doesn't evaluate the whole ModelChoiceField queryset.
+    The `url` view should respond in the `material.views.RemoteChoicesView`
+    format.
+    """
+    def __init__(self, url, attrs=None, choices=()):
+        super(RemoteSelect, self).__init__(attrs=attrs, choices=choices)
+        self.url = url
+        self.attrs.setdefault('data-form-control', 'remote-select')
+
+    @property
+    def url(self):
+        return self.attrs['data-url']
+
+    @url.setter
+    def url(self, value):
+        self.attrs['data-url'] = value
+
+    def selected_choices(self, values):
+        """
+        Returns the empty and the selected choices only.
+        """
+        values = set(force_text(v) for v in values if v not in (None, ''))
+
+        if isinstance(self.choices, ModelChoiceIterator):
+            field = self.choices.field
+            choices = []
+            if field.empty_label is not None:
+                choices.append(('', field.empty_label))
+            if values:
+                key = field.to_field_name or 'pk'
+                try:
+                    queryset = self.choices.queryset.filter(**{'{}__in'.format(key): values})
+                    choices.extend(self.choices.choice(obj) for obj in queryset)
+                except (ValueError, TypeError, ValidationError):
+                    # invalid submitted value
+                    pass
+            return choices
+
+        choices = []
+        for option_value, option_label in self.choices:
+            if isinstance(option_label, (list, tuple)):
+                choices.extend(
+                    (value, label) for value, label in option_label
+                    if force_text(value) in values)
+            elif option_value in (None, '') or force_text(option_value) in values:
+                choices.append((option_value, option_label))
+        return choices
+
+
+class RemoteSelectMultiple(RemoteSelect, SelectMultiple):
+    """
+    Multiple select with choices loaded from a JSON endpoint.
+    """
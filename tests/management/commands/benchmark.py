@@ -0,0 +1,148 @@
+"""
+Form rendering throughput benchmark.
+
+Usage::
+
+    ./manage.py benchmark [--number 50] [--filter select]
+"""
+from __future__ import division, print_function
+
+import gc
+import math
+from timeit import default_timer
+
+from django import forms
+from django.core.management.base import BaseCommand
+from django.forms import formset_factory
+from django.template import Context, Template
+
+from demo import forms as demo_forms
+from material import Layout
+
+try:
+    import tracemalloc
+except ImportError:
+    # python 2.7
+    tracemalloc = None
+
+
+FORM_TEMPLATE = Template('{% load material_form %}{% form %}{% endform %}')
+
+FORMSET_TEMPLATE = Template('''
+    {% load material_form %}
+    {{ formset.management_form }}
+    {% for form in formset %}{% form form=form %}{% endform %}{% endfor %}
+''')
+
+
+def synthetic_form(fields_count):
+    fields = {'field_{}'.format(n): forms.CharField() for n in range(fields_count)}
+    return type('Synthetic{}Form'.format(fields_count), (forms.Form,), fields)
+
+
+def select_form(choices_count, multiple=False):
+    choices = [(n, 'Option {}'.format(n)) for n in range(choices_count)]
+    field_cls = forms.MultipleChoiceField if multiple else forms.ChoiceField
+    return type('Select{}Form'.format(choices_count), (forms.Form,), {
+        'select_field': field_cls(choices=choices)
+    })
+
+
+def overrides_case(fields_count, layout_fields_count):
+    """
+    Form with part overrides for each field, but only a few fields in the layout.
+    """
+    form_cls = synthetic_form(fields_count)
+    form_cls.layout = Layout(*['field_{}'.format(n) for n in range(layout_fields_count)])
+    template = Template('{{% load material_form %}}{{% form %}}{}{{% endform %}}'.format(''.join(
+        '{{% part form.field_{0} prefix %}}<i class="prefix">{{{{ form.field_{0}.label }}}}</i>{{% endpart %}}'
+        '{{% part form.field_{0} help_text %}}<small>{{{{ form.field_{0}.help_text }}}}</small>{{% endpart %}}'
+        .format(n) for n in range(fields_count))))
+    return template, lambda: Context({'form': form_cls()})
+
+
+def form_case(form_cls, data=None):
+    return FORM_TEMPLATE, lambda: Context({'form': form_cls(data)})
+
+
+def formset_case(form_cls, extra):
+    formset_cls = formset_factory(form_cls, extra=extra)
+    return FORMSET_TEMPLATE, lambda: Context({'formset': formset_cls()})
+
+
+def get_cases():
+    cases = [
+        ('demo_{}'.format(form_cls.__name__.lower()), form_case(form_cls))
+        for form_cls in [
+            demo_forms.LoginForm, demo_forms.RegistrationForm, demo_forms.ContactForm,
+            demo_forms.OrderForm, demo_forms.CheckoutForm, demo_forms.CommentForm,
+            demo_forms.BankForm]
+    ]
+    cases.append(('demo_bankform_invalid', form_case(demo_forms.BankForm, {})))
+
+    for fields_count in [10, 100, 1000]:
+        cases.append(('fields_{}'.format(fields_count), form_case(synthetic_form(fields_count))))
+
+    for choices_count in [1000, 5000]:
+        cases.append(('select_{}'.format(choices_count), form_case(select_form(choices_count))))
+        cases.append(('selectmultiple_{}'.format(choices_count),
+                      form_case(select_form(choices_count, multiple=True))))
+
+    cases.append(('overrides_100_layout_10', overrides_case(100, 10)))
+    cases.append(('formset_20_bankform', formset_case(demo_forms.BankForm, 20)))
+    return cases
+
+
+def percentile(timings, percent):
+    timings = sorted(timings)
+    position = int(math.ceil(percent / 100 * len(timings))) - 1
+    return timings[max(position, 0)]
+
+
+def measure(template, get_context, number):
+    template.render(get_context())  # warm up loaders and caches
+
+    timings = []
+    gc.collect()
+    for _ in range(number):
+        context = get_context()
+        start = default_timer()
+        template.render(context)
+        timings.append(default_timer() - start)
+
+    peak = None
+    if tracemalloc is not None:
+        context = get_context()
+        tracemalloc.start()
+        try:
+            template.render(context)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return timings, peak
+
+
+class Command(BaseCommand):
+    help = 'Measure form rendering throughput'
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=20, help='Renders per benchmark')
+        parser.add_argument('--filter', default='', help='Run only benchmarks containing the string')
+
+    def handle(self, *args, **options):
+        row = '{:<26} {:>12} {:>10} {:>10} {:>12}'
+        self.stdout.write(row.format('benchmark', 'renders/sec', 'p50 ms', 'p99 ms', 'peak KiB'))
+
+        for name, (template, get_context) in get_cases():
+            if options['filter'] not in name:
+                continue
+
+            timings, peak = measure(template, get_context, options['number'])
+            self.stdout.write(row.format(
+                name,
+                '{:.1f}'.format(len(timings) / sum(timings)),
+                '{:.2f}'.format(percentile(timings, 50) * 1000),
+                '{:.2f}'.format(percentile(timings, 99) * 1000),
+                '{:.0f}'.format(peak / 1024) if peak is not None else '-'))
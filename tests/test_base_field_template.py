@@ -0,0 +1,56 @@
+from django import forms
+from django.template import TemplateDoesNotExist
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from material import base
+
+
+class UnknownWidget(forms.Widget):
+    pass
+
+
+class Test(SimpleTestCase):
+    def setUp(self):
+        base.clear_field_templates_cache()
+
+    def test_field_template_cached(self):
+        field = forms.CharField()
+        template = base._get_field_template('material', field)
+
+        self.assertEqual('material/fields/django_input.html', template.template.name)
+        self.assertEqual(
+            'material/fields/django_input.html',
+            base._field_templates_cache[('material', forms.CharField, forms.TextInput)])
+
+    def test_missing_field_template_cached(self):
+        field = forms.CharField(widget=UnknownWidget)
+        with self.assertRaises(TemplateDoesNotExist):
+            base._get_field_template('material', field)
+
+        self.assertIsNone(base._field_templates_cache[('material', forms.CharField, UnknownWidget)])
+
+        with self.assertRaises(TemplateDoesNotExist):
+            base._get_field_template('material', field)
+
+    def test_field_template_cache_disabled(self):
+        with override_settings(MATERIAL_FIELD_TEMPLATES_CACHE=False):
+            base._get_field_template('material', forms.CharField())
+            self.assertEqual({}, base._field_templates_cache)
+
+    def test_field_template_cache_debug(self):
+        with override_settings(DEBUG=True):
+            base._get_field_template('material', forms.CharField())
+            self.assertEqual({}, base._field_templates_cache)
+
+    def test_field_template_cache_debug_cached_loaders(self):
+        templates = [{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'OPTIONS': {
+                'loaders': [('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.app_directories.Loader'])],
+            },
+        }]
+        with override_settings(DEBUG=True, TEMPLATES=templates):
+            base._get_field_template('material', forms.CharField())
+            self.assertIn(('material', forms.CharField, forms.TextInput), base._field_templates_cache)
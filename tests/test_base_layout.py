@@ -1,7 +1,8 @@
 from django import forms
+from django.test import SimpleTestCase
 from django.test.utils import override_settings
 from django_webtest import WebTest
-from material import Layout, Row, Column
+from material import Layout, Row, Column, Span2
 from . import build_test_urls
 
 
@@ -33,4 +34,25 @@ class Test(WebTest):
         {% endform %}
     """
 
+
+class TestCompile(SimpleTestCase):
+    def test_layout_fields(self):
+        layout = LayoutForm.layout
+
+        self.assertEqual(
+            ['test_field1', 'test_field2', 'test_field3', 'test_field4', 'test_field5'],
+            layout.fields)
+        self.assertIs(layout.compile()._fields, layout.compile()._fields)
+
+    def test_row_spans(self):
+        row = Row(Span2('test_field1'), 'test_field2')
+
+        spans = [(element.field_name, span) for element, span in row.container_12()]
+        self.assertEqual([('test_field1', 8), ('test_field2', 4)], spans)
+        self.assertIs(row.get_container_spans(12), row.get_container_spans(12))
+
+    def test_row_unknown_attr(self):
+        self.assertFalse(hasattr(Row('test_field1'), 'row_class'))
+
+
 urlpatterns = build_test_urls(Test)
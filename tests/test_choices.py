@@ -0,0 +1,80 @@
+from django import forms
+from django.contrib.auth.models import Group
+from django.template import Context, Template
+from django.test import TestCase
+
+from material.choices import choices_cache
+
+
+class GroupForm(forms.Form):
+    group = forms.ModelChoiceField(queryset=Group.objects.all())
+
+
+GroupFormSet = forms.formset_factory(GroupForm, extra=5)
+
+
+class Test(TestCase):
+    template = Template(
+        '{% load material_form_internal %}'
+        '{% for form in formset %}{% select_options_html form.group %}{% endfor %}')
+
+    def setUp(self):
+        Group.objects.create(name='Admins')
+        Group.objects.create(name='Users')
+
+    def test_choices_query_shared(self):
+        with choices_cache():
+            with self.assertNumQueries(1):
+                html = self.template.render(Context({'formset': GroupFormSet()}))
+        self.assertEqual(5, html.count('>Admins</option>'))
+
+    def test_choices_cache_inactive(self):
+        with self.assertNumQueries(5):
+            self.template.render(Context({'formset': GroupFormSet()}))
+
+    def test_different_querysets(self):
+        class FilteredGroupForm(forms.Form):
+            group = forms.ModelChoiceField(queryset=Group.objects.filter(name='Users'))
+
+        template = Template(
+            '{% load material_form_internal %}'
+            '{% select_options_html form.group %}{% select_options_html filtered.group %}')
+
+        with choices_cache():
+            with self.assertNumQueries(2):
+                html = template.render(Context({'form': GroupForm(), 'filtered': FilteredGroupForm()}))
+        self.assertEqual(1, html.count('>Admins</option>'))
+        self.assertEqual(2, html.count('>Users</option>'))
+
+    def test_custom_label_from_instance(self):
+        class LabeledGroupForm(GroupForm):
+            def __init__(self, *args, **kwargs):
+                super(LabeledGroupForm, self).__init__(*args, **kwargs)
+                self.fields['group'].label_from_instance = lambda obj: 'CUSTOM {}'.format(obj.name)
+
+        template = Template(
+            '{% load material_form_internal %}'
+            '{% select_options_html form.group %}{% select_options_html labeled.group %}')
+
+        with choices_cache():
+            html = template.render(Context({'form': GroupForm(), 'labeled': LabeledGroupForm()}))
+        self.assertEqual(1, html.count('>Admins</option>'))
+        self.assertEqual(1, html.count('>CUSTOM Admins</option>'))
+
+    def test_cache_cleared_on_save(self):
+        template = Template('{% load material_form_internal %}{% select_options_html form.group %}')
+
+        with choices_cache():
+            template.render(Context({'form': GroupForm()}))
+            Group.objects.create(name='Guests')
+            html = template.render(Context({'form': GroupForm()}))
+        self.assertIn('>Guests</option>', html)
+
+    def test_select_multiple_single_pass(self):
+        class GroupsForm(forms.Form):
+            groups = forms.ModelMultipleChoiceField(queryset=Group.objects.all())
+
+        template = Template('{% load material_form %}{% form form=form %}{% endform %}')
+        with self.assertNumQueries(1):
+            html = template.render(Context({'form': GroupsForm()}))
+        self.assertIn('>Admins</option>', html)
@@ -0,0 +1,257 @@
+import base64
+import json
+
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from material.frontend.counters import CachedCount, EstimatedCount, HasMoreCount
+from material.frontend import datalist as datalist_module
+from material.frontend.datalist import DataList
+from material.frontend.forms import DatatableRequestForm
+
+
+class GroupDataSource(object):
+    def members(self, group):
+        return group.user_set.count()
+
+    def upper_name(self, group):
+        return group.name.upper()
+    upper_name.admin_order_field = 'name'
+
+
+class Test(TestCase):
+    def setUp(self):
+        for name in ['Beta', 'Alpha', 'Gamma', 'Alpha Two']:
+            Group.objects.create(name=name)
+
+    def create_datalist(self, **kwargs):
+        return DataList(
+            Group, Group.objects.all(), data_sources=[GroupDataSource()],
+            list_display=('name', 'upper_name', 'members'), **kwargs)
+
+    def names(self, datalist):
+        return [item.name for item, _ in datalist.get_data(0, 10)]
+
+    def test_sortable_columns(self):
+        self.assertEqual(['name', 'upper_name'], self.create_datalist().sortable_columns)
+
+    def test_ordering(self):
+        datalist = self.create_datalist()
+        datalist.set_ordering([('upper_name', True), ('members', False)])
+        self.assertEqual(['Gamma', 'Beta', 'Alpha Two', 'Alpha'], self.names(datalist))
+
+    def test_search(self):
+        datalist = self.create_datalist(search_fields=['^name'])
+        datalist.set_filter('alp')
+        datalist.set_ordering([('name', False)])
+
+        self.assertTrue(datalist.filtered)
+        self.assertEqual(['Alpha', 'Alpha Two'], self.names(datalist))
+        self.assertEqual(4, datalist.total())
+        self.assertEqual(2, datalist.total_filtered())
+
+    def test_search_to_many_relation_distinct(self):
+        user = User.objects.create(username='alpha')
+        user.groups.add(*Group.objects.filter(name__startswith='Alpha'))
+        Permission.objects.first().group_set.add(*Group.objects.all())
+
+        datalist = self.create_datalist(search_fields=['user__username'])
+        datalist.set_filter('alpha')
+        self.assertEqual(2, datalist.total_filtered())
+
+    def test_datatable_request_form(self):
+        form = DatatableRequestForm({
+            'draw': 1, 'start': 0, 'length': 10,
+            'search[value]': ' alpha ',
+            'order[1][column]': '0', 'order[1][dir]': 'asc',
+            'order[0][column]': '2', 'order[0][dir]': 'desc',
+        })
+        self.assertTrue(form.is_valid())
+        self.assertEqual('alpha', form.cleaned_data['search'])
+        self.assertEqual([(2, True), (0, False)], form.cleaned_data['ordering'])
+
+    def test_total_counted_once_without_filter(self):
+        datalist = self.create_datalist()
+        list(datalist.get_data(0, 10))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(4, datalist.total())
+            self.assertEqual(4, datalist.total_filtered())
+
+    def test_has_more_count(self):
+        datalist = self.create_datalist(counter=HasMoreCount())
+
+        self.assertEqual(3, len(list(datalist.get_data(0, 3))))
+        with self.assertNumQueries(0):
+            self.assertEqual(4, datalist.total())
+
+        list(datalist.get_data(3, 3))
+        self.assertEqual(4, datalist.total_filtered())
+
+    def test_cached_count(self):
+        cache.clear()
+        self.assertEqual(4, self.create_datalist(counter=CachedCount()).total())
+
+        with self.assertNumQueries(0):
+            self.assertEqual(4, self.create_datalist(counter=CachedCount()).total())
+
+    def test_estimated_count_fallback(self):
+        self.assertEqual(4, self.create_datalist(counter=EstimatedCount()).total())
+
+    def test_keyset_pagination(self):
+        datalist = self.create_datalist(keyset_pagination=True)
+        datalist.set_ordering([('name', True)])
+
+        self.assertEqual(['Gamma', 'Beta'], self.page_names(datalist, 0, 2))
+        cursor = datalist.next_cursor
+        self.assertIsNotNone(cursor)
+
+        datalist = self.create_datalist(keyset_pagination=True)
+        datalist.set_ordering([('name', True)])
+        with CaptureQueriesContext(connection) as queries:
+            names = self.page_names(datalist, 2, 2, cursor=cursor)
+        self.assertEqual(['Alpha Two', 'Alpha'], names)
+        self.assertIn('"auth_group"."name" <', queries[0]['sql'])
+        self.assertNotIn('OFFSET', queries[0]['sql'])
+
+    def test_keyset_pagination_invalid_cursor(self):
+        datalist = self.create_datalist(keyset_pagination=True)
+        datalist.set_ordering([('name', False)])
+        self.assertEqual(['Alpha Two', 'Beta'], self.page_names(datalist, 1, 2, cursor='invalid'))
+
+        other = self.create_datalist(keyset_pagination=True)
+        other.set_ordering([('name', True)])
+        list(other.get_data(0, 2))
+        self.assertIsNone(datalist.decode_cursor(datalist.get_keyset_ordering(), other.next_cursor))
+
+    def test_keyset_pagination_invalid_cursor_values(self):
+        datalist = self.create_datalist(keyset_pagination=True)
+        datalist.set_ordering([('name', False)])
+        cursor = base64.urlsafe_b64encode(json.dumps(
+            [datalist.get_keyset_ordering(), ['Alpha', 'not a pk']]).encode('utf-8'))
+        self.assertEqual(['Alpha Two', 'Beta'], self.page_names(datalist, 1, 2, cursor=cursor))
+
+    def test_keyset_pagination_nullable_ordering(self):
+        now = timezone.now()
+        for n in range(15):
+            User.objects.create(
+                username='u{:02d}'.format(n),
+                last_login=now - timezone.timedelta(days=n) if n < 7 else None)
+
+        def create_datalist():
+            datalist = DataList(User, User.objects.all(), list_display=('username', 'last_login'),
+                                keyset_pagination=True)
+            datalist.set_ordering([('last_login', True)])
+            return datalist
+
+        self.assertIsNone(create_datalist().get_keyset_ordering())
+
+        usernames, cursor = [], None
+        for start in range(0, 15, 5):
+            datalist = create_datalist()
+            usernames.extend(item.username for item, _ in datalist.get_data(start, 5, cursor=cursor))
+            cursor = datalist.next_cursor
+        self.assertEqual(sorted(usernames), ['u{:02d}'.format(n) for n in range(15)])
+
+    def test_keyset_pagination_foreign_key_column(self):
+        def create_datalist():
+            datalist = DataList(
+                Permission, Permission.objects.all(), list_display=('codename', 'content_type'),
+                keyset_pagination=True)
+            datalist.set_ordering([('content_type', True)])
+            return datalist
+
+        expected = list(Permission.objects.order_by('-content_type_id', '-pk').values_list('pk', flat=True))
+        self.assertEqual(
+            [('content_type_id', True), ('id', True)], create_datalist().get_keyset_ordering())
+
+        pks, cursor = [], None
+        for start in range(0, len(expected), 10):
+            datalist = create_datalist()
+            with CaptureQueriesContext(connection) as queries:
+                pks.extend(item.pk for item, _ in datalist.get_data(start, 10, cursor=cursor))
+            if cursor is not None:
+                self.assertNotIn('OFFSET', queries[0]['sql'])
+            cursor = datalist.next_cursor
+        self.assertEqual(expected, pks)
+
+    def test_keyset_pagination_related_model_ordering(self):
+        datalist = DataList(
+            Permission, Permission.objects.all(), list_display=('codename', 'content_type'),
+            keyset_pagination=True)
+
+        ordering, ContentType._meta.ordering = ContentType._meta.ordering, ['model']
+        try:
+            datalist.set_ordering([('content_type', False)])
+            self.assertEqual(['content_type', 'pk'], list(datalist.queryset.query.order_by))
+            self.assertIsNone(datalist.get_keyset_ordering())
+        finally:
+            ContentType._meta.ordering = ordering
+
+    def page_names(self, datalist, start, length, cursor=None):
+        return [item.name for item, _ in datalist.get_data(start, length, cursor=cursor)]
+
+    def test_columns_resolved_once(self):
+        class CountingDataList(DataList):
+            lookups = 0
+
+            def get_data_attr(self, attr_name):
+                CountingDataList.lookups += 1
+                return super(CountingDataList, self).get_data_attr(attr_name)
+
+        datalist = CountingDataList(
+            Group, Group.objects.all(), data_sources=[GroupDataSource()],
+            list_display=('name', 'upper_name', 'members'))
+        list(datalist.get_headers_data())
+        list(datalist.get_data(0, 10))
+        datalist.set_ordering([('name', False)])
+
+        self.assertEqual(3, CountingDataList.lookups)
+
+    def test_select_related_planned(self):
+        datalist = DataList(
+            Permission, Permission.objects.all(), list_display=('name', 'content_type'), only_fields=True)
+
+        self.assertEqual(['content_type'], datalist.get_select_related())
+        self.assertEqual(['id', 'name', 'content_type', 'codename'], datalist.get_only_fields())
+        with self.assertNumQueries(1):
+            rows = list(datalist.get_data(0, 5))
+        self.assertEqual(5, len(rows))
+
+    def test_select_related_override(self):
+        datalist = DataList(
+            Permission, Permission.objects.all(), list_display=('name', 'content_type'), select_related=False)
+        self.assertEqual([], datalist.get_select_related())
+
+    def test_no_only_for_computed_columns(self):
+        self.assertIsNone(self.create_datalist(only_fields=True).get_only_fields())
+
+    def test_only_fields_opt_in(self):
+        datalist = DataList(Permission, Permission.objects.all(), list_display=('name', 'content_type'))
+        self.assertIsNone(datalist.get_only_fields())
+
+        datalist = DataList(
+            Permission, Permission.objects.all(), list_display=('name', 'content_type'), only_fields=['name'])
+        self.assertEqual(['name'], datalist.get_only_fields())
+
+    def test_per_row_queries_warning(self):
+        warnings = []
+
+        class Logger(object):
+            def warning(self, msg, *args):
+                warnings.append(msg % args)
+
+        datalist = self.create_datalist()
+        logger, datalist_module.logger = datalist_module.logger, Logger()
+        try:
+            with self.settings(DEBUG=True), self.assertNumQueries(5):
+                list(datalist.get_data(0, 10))
+        finally:
+            datalist_module.logger = logger
+        self.assertEqual(["Group column 'members' runs 4 queries for 4 rows, "
+                          "use select_related or prefetch_related"], warnings)
@@ -0,0 +1,119 @@
+import json
+
+from django.contrib.auth.models import Group, User
+from django.test import RequestFactory, TestCase
+
+from material.frontend.views import ListModelView
+
+
+class GroupListView(ListModelView):
+    model = Group
+    list_display = ('name', )
+    search_fields = ('name', )
+
+    def has_view_permission(self, request, obj=None):
+        return True
+
+    def get_item_data(self, item):
+        return {'pk': item.pk}
+
+
+class Test(TestCase):
+    def setUp(self):
+        for n in range(5):
+            Group.objects.create(name='Group {}'.format(n))
+        self.user = User.objects.create(username='admin')
+
+    def get_json(self, view, **params):
+        query = {'draw': 2, 'start': 0, 'length': 10, 'order[0][column]': 0, 'order[0][dir]': 'asc'}
+        query.update(params)
+        request = RequestFactory().get('/', query, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        request.user = self.user
+
+        response = view(request)
+        if response.streaming:
+            content = b''.join(response.streaming_content)
+        else:
+            content = response.content
+        return json.loads(content.decode('utf-8'))
+
+    def test_json_data(self):
+        data = self.get_json(GroupListView.as_view(), length=2)
+        self.assertEqual(2, data['draw'])
+        self.assertEqual(['Group 0', 'Group 1'], [row['name'] for row in data['data']])
+        self.assertEqual(5, data['recordsTotal'])
+        self.assertEqual(5, data['recordsFiltered'])
+
+    def test_streaming_json_data(self):
+        for length in [0, 2, 4, 10]:
+            self.assertEqual(
+                self.get_json(GroupListView.as_view(), length=length),
+                self.get_json(GroupListView.as_view(json_streaming=True, json_streaming_chunk_size=2),
+                              length=length))
+
+    def test_invalid_request(self):
+        data = self.get_json(GroupListView.as_view(), draw='invalid')
+        self.assertIn('draw', data['error'])
+
+    def export(self, export_format, **params):
+        params['_export'] = export_format
+        request = RequestFactory().get('/', params)
+        request.user = self.user
+        response = GroupListView.as_view(export_chunk_size=2)(request)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv_export(self):
+        Group.objects.create(name='Comma, "quoted"')
+        response, content = self.export('csv')
+
+        self.assertEqual('text/csv', response['Content-Type'])
+        self.assertEqual('attachment; filename="group.csv"', response['Content-Disposition'])
+        self.assertEqual(
+            'name\r\nGroup 0\r\nGroup 1\r\nGroup 2\r\nGroup 3\r\nGroup 4\r\n"Comma, ""quoted"""\r\n', content)
+
+    def test_jsonl_export_filtered(self):
+        Group.objects.create(name='Other')
+        _, content = self.export('jsonl', q='group')
+
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(['Group {}'.format(n) for n in range(5)], [row['name'] for row in rows])
+
+    def test_export_chunked(self):
+        request = RequestFactory().get('/', {'_export': 'csv'})
+        request.user = self.user
+        response = GroupListView.as_view(export_chunk_size=2)(request)
+        with self.assertNumQueries(3):
+            b''.join(response.streaming_content)
+
+    def get_context(self, **initkwargs):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        view = GroupListView(request=request, **initkwargs)
+        view.object_list = view.get_queryset()
+        view.datalist = view.create_datalist()
+        return view.get_context_data()
+
+    def test_defer_loading(self):
+        context = self.get_context(defer_loading=True, paginate_by=2)
+        config = json.loads(context['datatable_config'])
+
+        self.assertEqual([5, 5], config['deferLoading'])
+        self.assertEqual(['Group 0', 'Group 1'], [row['name'] for _, row, _ in context['rows']])
+        self.assertEqual(self.get_json(GroupListView.as_view(), length=2)['data'], [
+            dict(row, **item_data) for _, row, item_data in context['rows']])
+
+    def test_defer_loading_keyset_cursor(self):
+        context = self.get_context(defer_loading=True, keyset_pagination=True, paginate_by=2)
+        page_info = json.loads(context['page_info'])
+
+        data = self.get_json(
+            GroupListView.as_view(keyset_pagination=True),
+            start=2, length=2, cursor=page_info['cursor'])
+        self.assertEqual(2, page_info['cursor_start'])
+        self.assertEqual(['Group 2', 'Group 3'], [row['name'] for row in data['data']])
+
+    def test_no_defer_loading(self):
+        context = self.get_context()
+        self.assertNotIn('deferLoading', json.loads(context['datatable_config']))
+        self.assertIsNone(json.loads(context['page_info']))
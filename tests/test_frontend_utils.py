@@ -0,0 +1,59 @@
+from django.conf.urls import include, url
+from django.conf.urls.i18n import i18n_patterns
+from django.core.urlresolvers import NoReverseMatch, reverse, set_script_prefix
+from django.test import TestCase, override_settings
+from django.utils import translation
+from django.views.generic import View
+
+from material.frontend.utils import reverse_pk_url
+
+
+item_patterns = [
+    url(r'^(?P<pk>.+)/detail/$', View.as_view(), name='item_detail'),
+    url(r'^(?P<pk>\d{1,3})/short/$', View.as_view(), name='item_short'),
+]
+
+urlpatterns = [
+    url(r'^items/', include(item_patterns, namespace='items')),
+]
+
+urlpatterns += i18n_patterns(
+    url(r'^shop/', include(item_patterns, namespace='shop')),
+)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class Test(TestCase):
+    def test_integer_pk(self):
+        for pk in [1, 42, 100500]:
+            self.assertEqual(
+                reverse_pk_url('items:item_detail', pk),
+                reverse('items:item_detail', args=[pk]))
+
+    def test_non_integer_pk_fallback(self):
+        for pk in ['a b', 'x/y', u'п']:
+            self.assertEqual(
+                reverse_pk_url('items:item_detail', pk),
+                reverse('items:item_detail', args=[pk]))
+
+    def test_restricted_pattern_fallback(self):
+        self.assertEqual(reverse_pk_url('items:item_short', 12), '/items/12/short/')
+        self.assertRaises(NoReverseMatch, reverse_pk_url, 'items:item_short', 1234)
+
+    def test_script_prefix(self):
+        set_script_prefix('/prefix/')
+        try:
+            self.assertEqual(reverse_pk_url('items:item_detail', 5), '/prefix/items/5/detail/')
+        finally:
+            set_script_prefix('/')
+        self.assertEqual(reverse_pk_url('items:item_detail', 5), '/items/5/detail/')
+
+    def test_language_prefix(self):
+        for language in ['en', 'de', 'en']:
+            with translation.override(language):
+                self.assertEqual(
+                    reverse_pk_url('shop:item_detail', 5),
+                    '/{}/shop/5/detail/'.format(language))
+
+    def test_unknown_url(self):
+        self.assertRaises(NoReverseMatch, reverse_pk_url, 'items:unknown', 1)
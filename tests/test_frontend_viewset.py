@@ -0,0 +1,121 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, User
+from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
+
+from material.frontend.views import ListModelView, ModelViewSet
+
+
+class CountingBackend(object):
+    """
+    Object permissions backend, allows to view the even pk objects.
+    """
+    calls = []
+
+    def authenticate(self, **credentials):
+        return None
+
+    def has_perm(self, user_obj, perm, obj=None):
+        CountingBackend.calls.append((perm, obj))
+        return obj is not None and perm == 'auth.view_group' and obj.pk % 2 == 0
+
+
+class CountingModelBackend(ModelBackend):
+    """
+    ModelBackend subclass with object permissions, allows to view the even pk objects.
+    """
+    calls = []
+
+    def has_perm(self, user_obj, perm, obj=None):
+        CountingModelBackend.calls.append((perm, obj))
+        if obj is not None and perm == 'auth.view_group':
+            return obj.pk % 2 == 0
+        return super(CountingModelBackend, self).has_perm(user_obj, perm, obj=obj)
+
+
+class GroupViewSet(ModelViewSet):
+    model = Group
+
+
+class EvenGroupViewSet(GroupViewSet):
+    def has_view_permission(self, request, obj=None):
+        return obj is None or obj.pk % 2 == 0
+
+
+class EvenGroupListView(ListModelView):
+    model = Group
+
+    def has_view_permission(self, request, obj=None):
+        return obj is None or obj.pk % 2 == 0
+
+
+class Test(TestCase):
+    def setUp(self):
+        CountingBackend.calls, CountingModelBackend.calls = [], []
+        self.groups = [Group.objects.create(name='Group {}'.format(n)) for n in range(4)]
+        self.request = RequestFactory().get('/')
+        self.request.user = User.objects.create(username='user')
+
+    @override_settings(AUTHENTICATION_BACKENDS=['tests.test_frontend_viewset.CountingBackend'])
+    def test_permissions_memoised_per_request(self):
+        viewset = GroupViewSet()
+        self.assertFalse(viewset.has_change_permission(self.request))
+        self.assertFalse(viewset.has_view_permission(self.request))
+        self.assertFalse(viewset.has_view_permission(self.request))
+        self.assertEqual(['auth.change_group', 'auth.view_group'], [perm for perm, _ in CountingBackend.calls])
+
+    @override_settings(AUTHENTICATION_BACKENDS=['tests.test_frontend_viewset.CountingBackend'])
+    def test_object_permissions(self):
+        self.assertEqual(
+            [group.pk % 2 == 0 for group in self.groups],
+            GroupViewSet().get_view_permissions(self.request, self.groups))
+
+    @override_settings(AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.ModelBackend'])
+    def test_model_backend_checked_once(self):
+        calls, has_perm = [], ModelBackend.__dict__['has_perm']
+
+        def counting_has_perm(backend, user_obj, perm, obj=None):
+            calls.append((perm, obj))
+            return has_perm(backend, user_obj, perm, obj=obj)
+
+        ModelBackend.has_perm = counting_has_perm
+        try:
+            self.assertEqual([False] * 4, GroupViewSet().get_view_permissions(self.request, self.groups))
+        finally:
+            ModelBackend.has_perm = has_perm
+        self.assertEqual(2, len(calls))
+
+    @override_settings(AUTHENTICATION_BACKENDS=['tests.test_frontend_viewset.CountingModelBackend'])
+    def test_model_backend_subclass_object_permissions(self):
+        self.assertEqual(
+            [group.pk % 2 == 0 for group in self.groups],
+            GroupViewSet().get_view_permissions(self.request, self.groups))
+
+    @override_settings(AUTHENTICATION_BACKENDS=['tests.test_frontend_viewset.CountingBackend'])
+    def test_superuser(self):
+        self.request.user.is_superuser = True
+        self.assertEqual([True] * 4, GroupViewSet().get_view_permissions(self.request, self.groups))
+        self.assertEqual([], CountingBackend.calls)
+
+    @override_settings(AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.ModelBackend'])
+    def test_overridden_view_permission(self):
+        expected = [group.pk % 2 == 0 for group in self.groups]
+        self.assertEqual(expected, EvenGroupViewSet().get_view_permissions(self.request, self.groups))
+
+        self.request.user.is_superuser = True
+        self.assertEqual(expected, EvenGroupViewSet().get_view_permissions(self.request, self.groups))
+
+    @override_settings(AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.ModelBackend'])
+    def test_overridden_list_view_permission(self):
+        view = EvenGroupListView(viewset=GroupViewSet())
+        self.assertEqual(
+            [group.pk % 2 == 0 for group in self.groups],
+            view.get_view_permissions(self.request, self.groups))
+
+    @override_settings(AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.ModelBackend'])
+    def test_permissions_memoised_per_user(self):
+        viewset = GroupViewSet()
+        self.assertFalse(viewset.has_change_permission(self.request))
+
+        self.request.user = User.objects.create(username='admin', is_superuser=True)
+        self.assertTrue(viewset.has_change_permission(self.request))
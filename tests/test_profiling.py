@@ -0,0 +1,73 @@
+from unittest import skipIf
+
+import django
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase
+from django.test.utils import override_settings
+
+from material.profiling import RenderProfileMiddleware, render_profile, render_profiled, get_profile
+
+from .test_base_layout import LayoutForm
+
+
+TEMPLATE = Template('{% load material_form %}{% form %}{% endform %}')
+
+
+class Test(SimpleTestCase):
+    def test_render_profile(self):
+        with render_profile() as profile:
+            TEMPLATE.render(Context({'form': LayoutForm()}))
+
+        timings = {(kind, name): count for kind, name, count, _ in profile.stats()}
+        self.assertEqual(1, timings[('form', 'LayoutForm')])
+        self.assertEqual(1, timings[('layout', 'Layout')])
+        self.assertEqual(2, timings[('layout', 'Row')])
+        self.assertEqual(1, timings[('field', 'test_field1')])
+        self.assertEqual(5, timings[('template', 'CharField/TextInput')])
+        self.assertIsNone(get_profile())
+
+    def test_profile_disabled(self):
+        TEMPLATE.render(Context({'form': LayoutForm()}))
+        self.assertIsNone(get_profile())
+
+    @override_settings(MATERIAL_RENDER_PROFILE=True)
+    def test_middleware(self):
+        profiles = []
+
+        def receiver(sender, request, profile, **kwargs):
+            profiles.append(profile)
+
+        render_profiled.connect(receiver)
+        try:
+            request = RequestFactory().get('/')
+            middleware = RenderProfileMiddleware()
+            middleware.process_request(request)
+            response = HttpResponse(TEMPLATE.render(Context({'form': LayoutForm()})))
+            middleware.process_response(request, response)
+        finally:
+            render_profiled.disconnect(receiver)
+
+        self.assertEqual(1, len(profiles))
+        self.assertIn(('form', 'LayoutForm'), profiles[0].timings)
+        self.assertIsNone(get_profile())
+
+    @skipIf(django.VERSION < (1, 10), 'MIDDLEWARE setting is available on django 1.10+')
+    @override_settings(MATERIAL_RENDER_PROFILE=True)
+    def test_new_style_middleware(self):
+        profiles = []
+
+        def receiver(sender, request, profile, **kwargs):
+            profiles.append(profile)
+
+        def get_response(request):
+            return HttpResponse(TEMPLATE.render(Context({'form': LayoutForm()})))
+
+        render_profiled.connect(receiver)
+        try:
+            RenderProfileMiddleware(get_response)(RequestFactory().get('/'))
+        finally:
+            render_profiled.disconnect(receiver)
+
+        self.assertEqual(1, len(profiles))
+        self.assertIsNone(get_profile())
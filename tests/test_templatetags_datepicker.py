@@ -0,0 +1,25 @@
+from django import forms
+from django.test import SimpleTestCase
+
+from material.templatetags import material_form_internal
+from material.templatetags.material_form_internal import jquery_datepicker_format
+
+
+class Test(SimpleTestCase):
+    def format(self, input_format):
+        return jquery_datepicker_format(forms.DateTimeField(input_formats=[input_format]))
+
+    def test_datepicker_format(self):
+        self.assertEqual('d.m.Y H:i:s', self.format('%d.%m.%Y %H:%M:%S'))
+        self.assertEqual('D, j F y g:i A', self.format('%a, %-d %B %y %-I:%M %p'))
+        self.assertEqual('l z W O T %', self.format('%A %j %V %z %Z %%'))
+
+    def test_literal_format_characters_escaped(self):
+        self.assertEqual('Y-m-d\\TH:i', self.format('%Y-%m-%dT%H:%M'))
+        self.assertEqual('d \\de F', self.format('%d de %B'))
+
+    def test_format_memoised(self):
+        material_form_internal._datepicker_formats.clear()
+        self.format('%Y/%m/%d')
+        self.format('%Y/%m/%d')
+        self.assertEqual({'%Y/%m/%d': 'Y/m/d'}, material_form_internal._datepicker_formats)
@@ -0,0 +1,109 @@
+from collections import defaultdict
+
+from django import forms
+from django.forms.utils import flatatt
+from django.template import Context, Template
+from django.test import SimpleTestCase
+from material import Layout
+from material.templatetags.material_form import WidgetAttrsNode, _flatatt
+
+
+class TextForm(forms.Form):
+    test_field = forms.CharField()
+
+
+class LayoutForm(forms.Form):
+    test_field = forms.CharField()
+    hidden_field = forms.CharField()
+
+    layout = Layout('test_field')
+
+
+class Counter(object):
+    def __init__(self):
+        self.hits = 0
+
+    def hit(self):
+        self.hits += 1
+        return self.hits
+
+
+INCLUDED = Template('''
+    {% load material_form %}
+    {% part form.test_field prefix %}<i class="included-prefix"></i>{% endpart %}
+    {% attr form.test_field 'widget' class append %}included{% endattr %}
+''')
+
+
+class Test(SimpleTestCase):
+    def render(self, template, **context):
+        return Template(template).render(Context(dict(form=TextForm(), included=INCLUDED, **context)))
+
+    def test_include_parts_and_attrs(self):
+        html = self.render('''
+            {% load material_form %}
+            {% form %}
+                {% attr form.test_field 'widget' class append %}outer{% endattr %}
+                {% include included %}
+            {% endform %}
+        ''')
+
+        self.assertIn('<i class="included-prefix"></i>', html)
+        self.assertIn('class="outer included"', html)
+
+    def test_include_by_name(self):
+        html = self.render('''
+            {% load material_form %}
+            {% form %}{% include 'material/field_errors.html' %}{% endform %}
+        ''')
+
+        self.assertIn('id="id_test_field"', html)
+
+    def test_unused_part_not_rendered(self):
+        counter = Counter()
+        html = Template('''
+            {% load material_form %}
+            {% form %}
+                {% part form.test_field prefix %}<i class="prefix">{{ counter.hit }}</i>{% endpart %}
+                {% part form.hidden_field prefix %}<i>{{ counter.hit }}</i>{% endpart %}
+            {% endform %}
+        ''').render(Context({'form': LayoutForm(), 'counter': counter}))
+
+        self.assertIn('<i class="prefix">1</i>', html)
+        self.assertEqual(1, counter.hits)
+
+    def test_attrs_compiled(self):
+        template = Template('''
+            {% load material_form %}<input{% attrs bound_field 'widget' default field.widget.attrs %}
+                id="id_{{ bound_field.html_name }}" data-empty=""
+                class="control{% if bound_field.errors %} invalid{% endif %}"
+                {% if bound_field.value %}value="{{ bound_field.value }}"{% endif %} required
+            {% endattrs %}>''')
+        node = template.nodelist.get_nodes_by_type(WidgetAttrsNode)[0]
+        self.assertIsNotNone(node.compiled_attrs)
+
+        form = TextForm({'test_field': '<value>'})
+        context = Context({
+            'bound_field': form['test_field'],
+            'field': form.fields['test_field'],
+            'form_widget_attrs': defaultdict(dict)
+        })
+        compiled = template.render(context)
+        node.compiled_attrs = None
+
+        self.assertEqual(template.render(context), compiled)
+        self.assertIn(
+            '<input class="control" id="id_test_field" value="&lt;value&gt;" data-empty required>',
+            compiled)
+
+    def test_attrs_not_compiled(self):
+        template = Template('''
+            {% load material_form %}<input{% attrs bound_field 'widget' %}
+                data-{{ bound_field.name }}="1"
+            {% endattrs %}>''')
+        node = template.nodelist.get_nodes_by_type(WidgetAttrsNode)[0]
+        self.assertIsNone(node.compiled_attrs)
+
+    def test_flatatt(self):
+        attrs = {'id': 'id_field', 'class': '<b>', 'required': True, 'disabled': False}
+        self.assertEqual(flatatt(attrs), _flatatt(attrs))
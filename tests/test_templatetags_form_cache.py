@@ -0,0 +1,68 @@
+from django import forms
+from django.core.cache import cache
+from django.template import Context, Engine, Template
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from django.utils import translation
+
+
+class CacheForm(forms.Form):
+    test_field = forms.CharField()
+
+
+TEMPLATE = Template('''
+    {% load material_form %}
+    {% form cache=True %}{% part form.test_field prefix %}{{ marker }}{% endpart %}{% endform %}
+''')
+
+
+class Test(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def render(self, form, **context):
+        return TEMPLATE.render(Context(dict(form=form, **context)))
+
+    def test_unbound_form_cached(self):
+        self.assertIn('first', self.render(CacheForm(), marker='first'))
+        self.assertIn('first', self.render(CacheForm(), marker='second'))
+
+    def test_bound_form_not_cached(self):
+        self.render(CacheForm(), marker='first')
+        self.assertIn('second', self.render(CacheForm({}), marker='second'))
+
+    def test_cache_key_language(self):
+        self.render(CacheForm(), marker='first')
+        with translation.override('ru'):
+            self.assertIn('second', self.render(CacheForm(), marker='second'))
+
+    def test_cache_version(self):
+        self.render(CacheForm(), marker='first')
+        with override_settings(MATERIAL_FORM_CACHE_VERSION=2):
+            self.assertIn('second', self.render(CacheForm(), marker='second'))
+
+    def test_csrf_token_not_cached(self):
+        template = Template('''
+            {% load material_form %}
+            {% form cache=True %}{% part form.test_field prefix %}{% csrf_token %}{% endpart %}{% endform %}
+        ''')
+
+        self.assertIn('first_secret', template.render(Context({'form': CacheForm(), 'csrf_token': 'first_secret'})))
+        self.assertIn('second_secret', template.render(Context({'form': CacheForm(), 'csrf_token': 'second_secret'})))
+
+    def test_cache_key_tag_source_without_debug(self):
+        engine = Engine(debug=False, libraries={'material_form': 'material.templatetags.material_form'})
+        template = engine.from_string('''
+            {% load material_form %}
+            {% form cache=True %}{% part form.test_field prefix %}first{% endpart %}{% endform %}
+            {% form cache=True %}{% part form.test_field prefix %}second{% endpart %}{% endform %}
+        ''')
+        other_template = engine.from_string('''
+            {% load material_form %}
+            {% form cache=True %}{% part form.test_field prefix %}third{% endpart %}{% endform %}
+        ''')
+
+        html = template.render(Context({'form': CacheForm()}))
+        self.assertIn('first', html)
+        self.assertIn('second', html)
+        self.assertIn('third', other_template.render(Context({'form': CacheForm()})))
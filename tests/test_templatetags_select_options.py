@@ -0,0 +1,85 @@
+import gc
+import weakref
+
+from django import forms
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+from material.templatetags import material_form_internal
+
+
+class SelectForm(forms.Form):
+    test_field = forms.ChoiceField(choices=(
+        ('', 'Empty'),
+        ('V', 'Visa'),
+        ('Cards', (('M', 'Master<Card>'), ('P', 'Paypal'))),
+    ))
+    multiple_field = forms.MultipleChoiceField(choices=(
+        (None, 'Empty'), (1, 'One'), (2, 'Two')
+    ))
+
+
+class Test(SimpleTestCase):
+    def setUp(self):
+        material_form_internal._options_html_cache.clear()
+
+    def render(self, template, form, **context):
+        template = Template('{% load material_form_internal %}' + template)
+        return template.render(Context(dict(form=form, **context)))
+
+    def test_select_options(self):
+        html = self.render('{% select_options_html form.test_field %}', SelectForm(initial={'test_field': 'M'}))
+
+        self.assertEqual(
+            '<option value>Empty</option>'
+            '<option value="V">Visa</option>'
+            '<optgroup label="Cards">'
+            '<option value="M" selected="selected">Master&lt;Card&gt;</option>'
+            '<option value="P">Paypal</option>'
+            '</optgroup>', html)
+
+    def test_select_options_empty_label(self):
+        html = self.render(
+            '{% select_options_html form.multiple_field empty_option="disabled" %}',
+            SelectForm({'multiple_field': ['1', '2']}), form_select_empty_label='Choose')
+
+        self.assertEqual(
+            '<option disabled>Choose</option>'
+            '<option value="1" selected="selected">One</option>'
+            '<option value="2" selected="selected">Two</option>', html)
+
+    def test_select_options_cached(self):
+        self.render('{% select_options_html form.test_field %}', SelectForm())
+        self.assertEqual(1, len(material_form_internal._options_html_cache))
+
+        html = self.render('{% select_options_html form.test_field %}', SelectForm(initial={'test_field': 'V'}))
+        self.assertEqual(1, len(material_form_internal._options_html_cache))
+        self.assertIn('<option value="V" selected="selected">Visa</option>', html)
+
+    def test_choice_view(self):
+        bound_field = SelectForm(initial={'test_field': 'M'})['test_field']
+        view = material_form_internal.choice_view(bound_field)
+
+        self.assertIs(view, material_form_internal.choice_view(bound_field))
+        self.assertTrue(view.has_default_choice)
+        self.assertEqual(set(['M']), view.selected)
+        self.assertEqual([
+            (None, [('Empty', '', False, 0), ('Visa', 'V', False, 1)]),
+            ('Cards', [('Master<Card>', 'M', True, 2), ('Paypal', 'P', False, 3)]),
+        ], view.groups)
+
+    def test_choice_view_released_with_form(self):
+        form = SelectForm()
+        self.render('{% select_options_html form.test_field %}', form)
+        view = weakref.ref(material_form_internal.choice_view(form['test_field']))
+
+        del form
+        gc.collect()
+        self.assertIsNone(view())
+
+    def test_choice_view_columns(self):
+        view = material_form_internal.choice_view(SelectForm()['multiple_field'])
+
+        self.assertEqual([
+            (None, [(6, [('Empty', '', False, 0), ('One', '1', False, 1)]), (6, [('Two', '2', False, 2)])]),
+        ], view.columns(2))
@@ -0,0 +1,23 @@
+from django import forms
+from django.contrib.admin.widgets import FilteredSelectMultiple
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+
+class FilteredSelectMultipleForm(forms.Form):
+    test_field = forms.MultipleChoiceField(
+        choices=(('', 'Empty'), ('V', 'Visa'), ('Cards', (('M', 'MasterCard'), ('P', 'Paypal')))),
+        widget=FilteredSelectMultiple('Cards', False))
+
+
+class Test(SimpleTestCase):
+    def test_grouped_choices_flat_options(self):
+        template = Template('{% load material_form %}{% form form=form %}{% endform %}')
+        html = template.render(Context({'form': FilteredSelectMultipleForm(initial={'test_field': ['M']})}))
+
+        self.assertIn('SelectFilter.init("id_test_field"', html)
+        self.assertNotIn('<optgroup', html)
+        self.assertIn('<option value="">Empty</option>', html)
+        self.assertIn('<option value="V">Visa</option>', html)
+        self.assertIn('<option value="M" selected="selected">MasterCard</option>', html)
+        self.assertIn('<option value="P">Paypal</option>', html)
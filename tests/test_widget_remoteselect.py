@@ -0,0 +1,86 @@
+import json
+
+from django import forms
+from django.contrib.auth.models import Group
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase
+
+from material.views import RemoteChoicesView
+from material.widgets import RemoteSelect, RemoteSelectMultiple
+
+
+class RemoteSelectForm(forms.Form):
+    group = forms.ModelChoiceField(
+        queryset=Group.objects.all(), widget=RemoteSelect(url='/groups/'))
+    groups = forms.ModelMultipleChoiceField(
+        queryset=Group.objects.all(), widget=RemoteSelectMultiple(url='/groups/'))
+    color = forms.ChoiceField(
+        choices=(('', 'Empty'), ('R', 'Red'), ('G', 'Green')), widget=RemoteSelect(url='/colors/'))
+
+
+class GroupChoicesView(RemoteChoicesView):
+    model = Group
+    search_fields = ['name']
+    paginate_by = 2
+
+
+class Test(TestCase):
+    def setUp(self):
+        self.groups = [Group.objects.create(name='Group {}'.format(i)) for i in range(5)]
+
+    def render(self, template, form):
+        template = Template('{% load material_form_internal %}' + template)
+        return template.render(Context({'form': form}))
+
+    def test_selected_option_rendered_only(self):
+        form = RemoteSelectForm(initial={'group': self.groups[2].pk})
+
+        with self.assertNumQueries(1):
+            html = self.render('{% select_options_html form.group %}', form)
+
+        self.assertEqual(
+            '<option value>---------</option>'
+            '<option value="{}" selected="selected">Group 2</option>'.format(self.groups[2].pk), html)
+
+    def test_no_queries_without_value(self):
+        with self.assertNumQueries(0):
+            html = self.render('{% select_options_html form.group %}', RemoteSelectForm())
+        self.assertEqual('<option value>---------</option>', html)
+
+    def test_invalid_value(self):
+        html = self.render('{% select_options_html form.group %}', RemoteSelectForm({'group': 'invalid'}))
+        self.assertEqual('<option value>---------</option>', html)
+
+    def test_multiple_selected(self):
+        form = RemoteSelectForm({'groups': [self.groups[0].pk, self.groups[4].pk]})
+        html = self.render('{% select_options_html form.groups %}', form)
+
+        self.assertIn('Group 0', html)
+        self.assertIn('Group 4', html)
+        self.assertNotIn('Group 1', html)
+
+    def test_static_choices(self):
+        html = self.render('{% select_options_html form.color %}', RemoteSelectForm(initial={'color': 'G'}))
+        self.assertEqual('<option value>Empty</option><option value="G" selected="selected">Green</option>', html)
+
+    def test_widget_attrs(self):
+        widget = RemoteSelectForm().fields['group'].widget
+        self.assertEqual('remote-select', widget.attrs['data-form-control'])
+        self.assertEqual('/groups/', widget.attrs['data-url'])
+
+    def test_choices_view(self):
+        view = GroupChoicesView.as_view()
+
+        response = view(RequestFactory().get('/groups/'))
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(['Group 0', 'Group 1'], [choice['text'] for choice in data['results']])
+        self.assertTrue(data['more'])
+
+        response = view(RequestFactory().get('/groups/', {'page': 3}))
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual([{'id': str(self.groups[4].pk), 'text': 'Group 4'}], data['results'])
+        self.assertFalse(data['more'])
+
+        response = view(RequestFactory().get('/groups/', {'q': 'p 3'}))
+        data = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(['Group 3'], [choice['text'] for choice in data['results']])
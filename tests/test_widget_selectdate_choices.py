@@ -0,0 +1,42 @@
+from django import forms
+from django.test import SimpleTestCase
+from django.utils import translation
+
+from material import widgets
+from material.widgets import SelectDateWidget
+
+
+class SelectDateForm(forms.Form):
+    test_field = forms.DateField(
+        widget=forms.SelectDateWidget(years=(2016, 2017)) if hasattr(forms, 'SelectDateWidget')
+        else forms.extras.SelectDateWidget(years=(2016, 2017)))
+
+
+class Test(SimpleTestCase):
+    def setUp(self):
+        widgets._select_date_choices.clear()
+        widgets._date_fields_order.clear()
+
+    def selects(self, value=None):
+        widget = SelectDateWidget(SelectDateForm().fields['test_field'].widget)
+        return {data['type']: data for data in widget.selects_data(value)}
+
+    def test_choices_cached(self):
+        selects = self.selects()
+        self.assertEqual([(2016, 2016), (2017, 2017)], selects['year']['choices'])
+        self.assertEqual(31, len(selects['day']['choices']))
+        self.assertEqual(3, len(widgets._select_date_choices))
+
+        self.assertIs(selects['month']['choices'], self.selects()['month']['choices'])
+
+    def test_month_choices_per_language(self):
+        with translation.override('en'):
+            self.assertEqual((1, 'January'), self.selects()['month']['choices'][0])
+        with translation.override('de'):
+            self.assertEqual((1, 'Januar'), self.selects()['month']['choices'][0])
+
+    def test_fields_order_cached(self):
+        with self.settings(DATE_FORMAT=r'\Y j F Y', USE_L10N=False):
+            widget = SelectDateWidget(SelectDateForm().fields['test_field'].widget)
+            self.assertEqual(('day', 'month', 'year'), widget.parse_date_fmt())
+            self.assertEqual({r'\Y j F Y': ('day', 'month', 'year')}, widgets._date_fields_order)